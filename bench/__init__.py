@@ -0,0 +1 @@
+"""Benchmarks for pdf_ops. Run with `python -m bench --help`."""
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+# Allow `python -m bench` from the repository root without installing anything
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import corpus as bench_corpus
+from bench.cases import CASES
+from bench.runner import compare, load_results, run_cases, save_results
+from bench.startup import heavy_imports, run_startup
+
+DEFAULT_CORPUS_DIR = os.path.join(os.path.expanduser("~"), ".cache", "doc-tor", "bench")
+
+console = Console()
+
+def main(
+    case: list[str] = typer.Option(None, help=f"Benchmark to run (repeatable). Available: {', '.join(CASES)}, startup"),
+    scale: str = typer.Option("default", help=f"Corpus size: {', '.join(bench_corpus.SCALES)}"),
+    repeats: int = typer.Option(3, help="Timed runs per benchmark"),
+    output: str = typer.Option("bench_results.json", help="Where to write the results"),
+    baseline: str = typer.Option(None, help="Baseline results to compare against"),
+    threshold: float = typer.Option(0.2, help="Allowed slowdown against the baseline (0.2 = 20%)"),
+    trace: bool = typer.Option(False, "--tracemalloc", help="Also record the peak Python heap (slower)"),
+    corpus_dir: str = typer.Option(DEFAULT_CORPUS_DIR, help="Where the synthetic corpus is generated and kept"),
+    startup_budget: float = typer.Option(None, help="Fail if `import cli` takes longer than this many seconds (median)"),
+):
+    """Benchmark pdf_ops on a synthetic corpus, optionally failing on regressions."""
+    if scale not in bench_corpus.SCALES:
+        console.print(f"[bold red]Error:[/bold red] Unknown scale '{scale}'.")
+        raise typer.Exit(2)
+    # "startup" selects the CLI startup timings, which run in fresh interpreters
+    startup = not case or "startup" in case or startup_budget is not None
+    case = [name for name in case or [] if name != "startup"] or (None if not case else [])
+    corpus = None
+    if case != []:
+        with console.status(f"[bold green]Preparing {scale} corpus..."):
+            corpus = bench_corpus.build(corpus_dir, scale)
+
+    table = Table(title=f"pdf_ops benchmarks ({scale})")
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Median (s)", justify="right")
+    table.add_column("Min (s)", justify="right")
+    table.add_column("Peak RSS (MB)", justify="right")
+    table.add_column("RSS growth (MB)", justify="right")
+    with console.status("[bold green]Running...") as status:
+        def on_result(name, result):
+            status.update(f"[bold green]Finished {name}...")
+            table.add_row(name, f"{result['median']:.3f}", f"{result['min']:.3f}", *("-" if result[key] is None else str(result[key]) for key in ("peak_rss_mb", "rss_growth_mb")))
+        try:
+            results = run_cases(corpus, case, repeats=repeats, trace=trace, on_result=on_result) if corpus else {}
+        except ValueError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            raise typer.Exit(2)
+        if startup:
+            status.update("[bold green]Timing CLI startup...")
+            for name, result in run_startup(max(repeats, 5)).items():
+                results[name] = result
+                on_result(name, result)
+    console.print(table)
+    save_results(output, results, scale)
+    console.print(f"Results written to '{output}'.")
+
+    failed = False
+    if startup:
+        heavy = heavy_imports()
+        if heavy:
+            console.print(f"[bold red]`import cli` loads conversion modules:[/bold red] {', '.join(heavy)}")
+            failed = True
+        if startup_budget is not None and results["startup_import_cli"]["median"] > startup_budget:
+            console.print(f"[bold red]Startup budget exceeded:[/bold red] {results['startup_import_cli']['median']:.3f}s > {startup_budget:.3f}s")
+            failed = True
+
+    if baseline:
+        previous = load_results(baseline)
+        if previous["environment"].get("scale") != scale:
+            console.print(f"[yellow]Baseline was recorded at scale '{previous['environment'].get('scale')}'.[/yellow]")
+        diff = Table(title=f"Against {baseline}")
+        diff.add_column("Benchmark", style="cyan")
+        diff.add_column("Baseline (s)", justify="right")
+        diff.add_column("Now (s)", justify="right")
+        diff.add_column("Change", justify="right")
+        regressions = []
+        for name, old, new, ratio, regressed in compare(results, previous, threshold):
+            if regressed:
+                regressions.append(name)
+            change = "new" if ratio is None else f"{(ratio - 1) * 100:+.0f}%"
+            diff.add_row(name, "-" if old is None else f"{old:.3f}", f"{new:.3f}", f"[red]{change}[/red]" if regressed else change)
+        console.print(diff)
+        if regressions:
+            console.print(f"[bold red]Regressed by more than {threshold:.0%}:[/bold red] {', '.join(regressions)}")
+            failed = True
+        else:
+            console.print("[bold green]No regressions.[/bold green]")
+    if failed:
+        raise typer.Exit(1)
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,90 @@
+import os
+import shutil
+
+import pdf_ops
+
+from bench.corpus import SECRET_TERMS
+
+# Each case is (setup, reset, run). setup(corpus, out_dir) runs once, untimed, and returns
+# the arguments passed to run(corpus, out_dir, *args) on every timed repeat. reset(corpus,
+# out_dir, *args) runs untimed before each repeat, for cases that change their input.
+CASES = {}
+
+def case(name, setup=None, reset=None):
+    def register(run):
+        CASES[name] = (setup, reset, run)
+        return run
+    return register
+
+def _out(out_dir, name):
+    return os.path.join(out_dir, name)
+
+@case("info")
+def _info(corpus, out_dir):
+    pdf_ops.get_pdf_info(corpus["text"])
+
+@case("info_small_files")
+def _info_many(corpus, out_dir):
+    for path in corpus["small"]:
+        pdf_ops.get_pdf_info(path)
+
+@case("extract_text")
+def _extract(corpus, out_dir):
+    pdf_ops.extract_text_from_pdf(corpus["text"], _out(out_dir, "text.txt"))
+
+@case("extract_text_parallel")
+def _extract_parallel(corpus, out_dir):
+    pdf_ops.extract_text_from_pdf(corpus["text"], _out(out_dir, "text.txt"), workers=os.cpu_count() or 1)
+
+@case("merge_small_files")
+def _merge(corpus, out_dir):
+    pdf_ops.merge_pdfs(corpus["small"], _out(out_dir, "merged.pdf"))
+
+@case("merge_large")
+def _merge_large(corpus, out_dir):
+    pdf_ops.merge_pdfs([corpus["text"], corpus["images"]], _out(out_dir, "merged.pdf"))
+
+@case("redact")
+def _redact(corpus, out_dir):
+    pdf_ops.redact_pdf(corpus["text"], list(SECRET_TERMS), _out(out_dir, "redacted.pdf"))
+
+@case("redact_images")
+def _redact_images(corpus, out_dir):
+    pdf_ops.redact_pdf(corpus["images"], list(SECRET_TERMS), _out(out_dir, "redacted.pdf"))
+
+@case("edit")
+def _edit(corpus, out_dir):
+    pdf_ops.edit_pdf_text(corpus["text"], {"SECRET": "PUBLIC", "ACME Corp": "Initech"}, output_path=_out(out_dir, "edited.pdf"))
+
+@case("rotate")
+def _rotate(corpus, out_dir):
+    pdf_ops.rotate_pages(corpus["text"], 90, _out(out_dir, "rotated.pdf"))
+
+def _fresh_copy(corpus, out_dir, path):
+    # Each incremental save grows the file, so every repeat starts from a new copy
+    shutil.copyfile(corpus["text"], path)
+
+@case("rotate_incremental", setup=lambda corpus, out_dir: (_out(out_dir, "inc.pdf"),), reset=_fresh_copy)
+def _rotate_incremental(corpus, out_dir, path):
+    pdf_ops.rotate_pages(path, 90, pages="1", in_place=True, incremental=True)
+
+@case("delete")
+def _delete(corpus, out_dir):
+    pdf_ops.delete_pages(corpus["text"], "1-:2", _out(out_dir, "deleted.pdf"))
+
+@case("extract_page_range")
+def _extract_range(corpus, out_dir):
+    count = pdf_ops.get_pdf_info(corpus["text"])["pages"]
+    pdf_ops.extract_page_range(corpus["text"], 1, max(1, count // 2), _out(out_dir, "range.pdf"))
+
+@case("split_every_10")
+def _split(corpus, out_dir):
+    pdf_ops.split_pdf(corpus["text"], _out(out_dir, "split"), every=10)
+
+@case("encrypt")
+def _encrypt(corpus, out_dir):
+    pdf_ops.encrypt_pdf(corpus["text"], "bench", _out(out_dir, "encrypted.pdf"))
+
+@case("decrypt", setup=lambda corpus, out_dir: (pdf_ops.encrypt_pdf(corpus["text"], "bench", _out(out_dir, "to_decrypt.pdf")),))
+def _decrypt(corpus, out_dir, path):
+    pdf_ops.decrypt_pdf(path, "bench", _out(out_dir, "decrypted.pdf"))
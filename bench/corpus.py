@@ -0,0 +1,89 @@
+import os
+import random
+
+import pymupdf as fitz
+
+# Bump when the generators change so stale corpora are rebuilt
+CORPUS_VERSION = 1
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt "
+         "ut labore et dolore magna aliqua invoice account balance report quarterly summary").split()
+
+# Terms the redact and edit benchmarks look for; each text page contains a few of them
+SECRET_TERMS = ("SECRET", "John Smith", "ACME Corp")
+
+def _text_page(doc, rng, lines=45):
+    page = doc.new_page()
+    y = 60
+    for _ in range(lines):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 12))]
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), rng.choice(SECRET_TERMS))
+        page.insert_text((50, y), " ".join(words), fontsize=10)
+        y += 15
+
+def text_pdf(path, pages, seed=0):
+    """A text-heavy PDF with a table of contents entry every 10 pages."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for _ in range(pages):
+        _text_page(doc, rng)
+    doc.set_toc([[1, f"Section {n // 10 + 1}", n + 1] for n in range(0, pages, 10)])
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+def image_pdf(path, pages, seed=0, size=400):
+    """An image-heavy PDF: one noisy RGB image per page plus a caption line."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        pix = fitz.Pixmap(fitz.csRGB, size, size, rng.randbytes(size * size * 3), False)
+        page.insert_image(fitz.Rect(50, 80, 50 + size, 80 + size), pixmap=pix)
+        page.insert_text((50, 60), f"Figure {n + 1}: {rng.choice(SECRET_TERMS)}", fontsize=12)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+def small_pdfs(directory, count, seed=0):
+    """Many one- to three-page text PDFs, e.g. for merging."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for n in range(count):
+        path = os.path.join(directory, f"small_{n:05d}.pdf")
+        doc = fitz.open()
+        for _ in range(rng.randint(1, 3)):
+            _text_page(doc, rng, lines=10)
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+SCALES = {
+    # name: (text pages, image pages, small files)
+    "quick": (10, 10, 20),
+    "default": (500, 100, 200),
+    "full": (10000, 1000, 1000),
+}
+
+def build(directory, scale="default"):
+    """Generate (or reuse) the corpus for a scale. Returns a dict of named paths."""
+    text_pages, image_pages, small_count = SCALES[scale]
+    root = os.path.join(directory, f"v{CORPUS_VERSION}-{scale}")
+    os.makedirs(root, exist_ok=True)
+    corpus = {
+        "text": os.path.join(root, f"text_{text_pages}.pdf"),
+        "images": os.path.join(root, f"images_{image_pages}.pdf"),
+        "small_dir": os.path.join(root, "small"),
+    }
+    if not os.path.exists(corpus["text"]):
+        text_pdf(corpus["text"] + ".tmp", text_pages, seed=1)
+        os.replace(corpus["text"] + ".tmp", corpus["text"])
+    if not os.path.exists(corpus["images"]):
+        image_pdf(corpus["images"] + ".tmp", image_pages, seed=2)
+        os.replace(corpus["images"] + ".tmp", corpus["images"])
+    small = sorted(os.path.join(corpus["small_dir"], name) for name in os.listdir(corpus["small_dir"])) if os.path.isdir(corpus["small_dir"]) else []
+    if len(small) != small_count:
+        small = small_pdfs(corpus["small_dir"], small_count, seed=3)
+    corpus["small"] = small
+    return corpus
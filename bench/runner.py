@@ -0,0 +1,95 @@
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import pymupdf as fitz
+
+from bench.cases import CASES
+from metrics import peak_rss_mb
+
+def _measure(name, corpus, repeats, trace):
+    # Runs in a fresh process so peak RSS belongs to this case alone
+    setup, reset, run = CASES[name]
+    with tempfile.TemporaryDirectory(prefix="doctor_bench_") as out_dir:
+        args = setup(corpus, out_dir) if setup else ()
+        base_rss = peak_rss_mb()
+        runs = []
+        traced_peak = None
+        for _ in range(repeats):
+            if reset:
+                reset(corpus, out_dir, *args)
+            if trace:
+                tracemalloc.start()
+            start = time.perf_counter()
+            run(corpus, out_dir, *args)
+            runs.append(time.perf_counter() - start)
+            if trace:
+                traced_peak = max(traced_peak or 0, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+        peak_rss = peak_rss_mb()
+    result = {
+        "runs": [round(r, 4) for r in runs],
+        "min": round(min(runs), 4),
+        "median": round(statistics.median(runs), 4),
+        "peak_rss_mb": peak_rss,
+        "rss_growth_mb": round(peak_rss - base_rss, 1) if peak_rss is not None else None,
+    }
+    if trace:
+        result["python_peak_mb"] = round(traced_peak / (1024 * 1024), 1)
+    return result
+
+def run_cases(corpus, names=None, repeats=3, trace=False, on_result=None):
+    """Time each case in its own process. Returns {name: result}.
+
+    trace also records the peak Python heap with tracemalloc; it slows the runs down, so
+    compare timings of traced runs only with other traced runs.
+    """
+    names = names or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}. Choose from: {', '.join(CASES)}.")
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[name] = pool.submit(_measure, name, corpus, repeats, trace).result()
+        if on_result:
+            on_result(name, results[name])
+    return results
+
+def environment(scale):
+    return {
+        "python": platform.python_version(),
+        "pymupdf": fitz.VersionBind,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scale": scale,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def save_results(path, results, scale):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(scale), "results": results}, f, indent=2)
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold=0.2):
+    """Compare median timings to a baseline. Returns (name, baseline, current, ratio, regressed)
+    rows; a case regresses when it is more than threshold (0.2 = 20%) slower."""
+    rows = []
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if not old:
+            rows.append((name, None, result["median"], None, False))
+            continue
+        ratio = result["median"] / old["median"] if old["median"] else None
+        rows.append((name, old["median"], result["median"], ratio, ratio is not None and ratio > 1 + threshold))
+    return rows
@@ -0,0 +1,43 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that short commands must never import: the Word conversion stacks
+HEAVY_MODULES = ("pdf2docx", "docx2pdf", "docx", "cv2", "numpy", "office")
+
+# Fresh interpreters: importing the CLI, and what `cli.py --help` does end to end
+STARTUP_COMMANDS = {
+    "startup_import_cli": [sys.executable, "-c", "import cli"],
+    "startup_help": [sys.executable, os.path.join(REPO, "cli.py"), "--help"],
+}
+
+def _timed_run(cmd):
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=REPO, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+# Marks the child's answer, so whatever else importing cli prints is ignored
+SENTINEL = "doctor-heavy-modules:"
+
+def heavy_imports():
+    """HEAVY_MODULES that `import cli` loads."""
+    check = f"import json, sys, cli; print({SENTINEL!r} + json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    out = subprocess.run([sys.executable, "-c", check], cwd=REPO, capture_output=True, text=True, check=True).stdout
+    lines = [line for line in out.splitlines() if line.startswith(SENTINEL)]
+    if not lines:
+        raise RuntimeError("The import check printed no module list.")
+    return json.loads(lines[-1][len(SENTINEL):])
+
+def run_startup(repeats=5):
+    """Wall-clock startup timings, in the same shape as bench.runner results."""
+    results = {}
+    for name, cmd in STARTUP_COMMANDS.items():
+        _timed_run(cmd)  # warm the OS file cache and .pyc files
+        runs = [_timed_run(cmd) for _ in range(repeats)]
+        results[name] = {"runs": [round(r, 4) for r in runs], "min": round(min(runs), 4), "median": round(statistics.median(runs), 4), "peak_rss_mb": None, "rss_growth_mb": None}
+    return results
@@ -0,0 +1,140 @@
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pdf_ops
+
+DEFAULT_DB = os.path.join(os.path.expanduser("~"), ".cache", "doc-tor", "catalog.sqlite")
+
+# Scanned rows are committed in batches of this many, so an interrupted scan keeps its progress
+COMMIT_EVERY = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT,
+    info TEXT,
+    error TEXT,
+    scanned_at REAL NOT NULL
+)
+"""
+
+def open_db(db_path, schema):
+    """Open a SQLite database in WAL mode, creating its folder and tables as needed."""
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(schema)
+    return conn
+
+def under_dir(column, directory):
+    """SQL condition and arguments selecting paths in column that lie under directory, as a
+    range on the path index instead of a LIKE scan."""
+    low = os.path.join(os.path.abspath(directory), "")
+    # Every path under low sorts before low with its trailing separator bumped by one
+    return f"{column} >= ? AND {column} < ?", (low, low[:-1] + chr(ord(low[-1]) + 1))
+
+def connect(db_path=None):
+    return open_db(db_path or DEFAULT_DB, SCHEMA)
+
+def find_pdfs(root):
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(".pdf"):
+                yield os.path.abspath(os.path.join(dirpath, name))
+
+def _scan_file(path, use_hash, known_hash):
+    # Runs in a worker process. Returns (sha256, info, error); info is None with no error
+    # when the content hash matches known_hash, i.e. the cached metadata is still valid
+    sha256 = pdf_ops.file_hash(path) if use_hash else None
+    if sha256 and sha256 == known_hash:
+        return sha256, None, None
+    try:
+        return sha256, pdf_ops.get_pdf_info(path), None
+    except Exception as e:
+        return sha256, None, f"{type(e).__name__}: {e}"
+
+def _row(path, size, mtime_ns, sha256, info, error):
+    row = {"path": path, "size": size, "mtime": mtime_ns / 1e9}
+    if sha256:
+        row["sha256"] = sha256
+    row.update(info or {})
+    if error:
+        row["error"] = error
+    return row
+
+def scan(root, db_path=None, workers=None, use_hash=False, prune=True, on_progress=None):
+    """Return metadata rows for every PDF under root, opening only new or changed files.
+
+    A file is unchanged when its size and mtime match the catalog. With use_hash, a file
+    whose size/mtime changed but whose SHA-256 still matches is also served from the
+    catalog (e.g. after a copy or touch). prune drops catalog rows for deleted files.
+    on_progress(done, total) is called as changed files are scanned. Results are committed
+    every COMMIT_EVERY files, so a scan that is interrupted resumes where it stopped.
+    """
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"Directory '{root}' not found.")
+
+    conn = connect(db_path)
+    # One range query for everything under root instead of one lookup per file
+    condition, args = under_dir("path", root)
+    cached = {row[0]: row for row in conn.execute(
+        f"SELECT path, size, mtime_ns, sha256, info, error FROM files WHERE {condition}", args)}
+
+    rows = {}
+    changed = []
+    for path in find_pdfs(root):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        hit = cached.get(path)
+        if hit and hit[1] == st.st_size and hit[2] == st.st_mtime_ns:
+            rows[path] = _row(path, st.st_size, st.st_mtime_ns, hit[3], json.loads(hit[4]) if hit[4] else None, hit[5])
+        else:
+            changed.append((path, st.st_size, st.st_mtime_ns, hit))
+
+    if changed:
+        updates = []
+        paths = [c[0] for c in changed]
+        known = [hit[3] if hit else None for _, _, _, hit in changed]
+        if workers == 1 or len(changed) == 1:
+            results = map(_scan_file, paths, [use_hash] * len(paths), known)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(_scan_file, paths, [use_hash] * len(paths), known, chunksize=max(1, len(paths) // ((workers or os.cpu_count() or 1) * 8)))
+        def flush():
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", updates)
+            updates.clear()
+
+        try:
+            for done, ((path, size, mtime_ns, hit), (sha256, info, error)) in enumerate(zip(changed, results), 1):
+                if info is None and error is None:
+                    # Same content under a new mtime: keep the cached metadata
+                    info, error = json.loads(hit[4]) if hit[4] else None, hit[5]
+                rows[path] = _row(path, size, mtime_ns, sha256, info, error)
+                updates.append((path, size, mtime_ns, sha256, json.dumps(info) if info else None, error, time.time()))
+                if len(updates) >= COMMIT_EVERY:
+                    flush()
+                if on_progress:
+                    on_progress(done, len(changed))
+        finally:
+            # Also on an interrupt: whatever was scanned is kept for the next run
+            flush()
+            if pool:
+                pool.shutdown()
+
+    if prune:
+        gone = [(path,) for path in cached if path not in rows]
+        if gone:
+            with conn:
+                conn.executemany("DELETE FROM files WHERE path = ?", gone)
+    conn.close()
+    return [rows[path] for path in sorted(rows)]
@@ -2,16 +2,69 @@ import typer
 from rich.console import Console
 from rich.table import Table
 import os
+import sys
+import json
+import csv
 import pdf_ops
+import catalog
+import search_index
+import metrics
+import result_cache
 
 app = typer.Typer(help="Doc-Tor: A powerful CLI PDF Editor built with Python.")
 console = Console()
 
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+def stdin_or(file_path):
+    """'-' reads the PDF from stdin."""
+    return sys.stdin.buffer if file_path == "-" else file_path
+
+def stdio(file_path, output=None):
+    """Map '-' to stdin for the input and to stdout for the output, which is also the default
+    output for stdin input. While stdout carries the result, messages go to stderr."""
+    source = stdin_or(file_path)
+    if output == "-" or (file_path == "-" and output is None):
+        console.file = sys.stderr
+        output = sys.stdout.buffer
+    return source, output
+
+def where(saved):
+    return f"'{saved}'" if isinstance(saved, str) else "stdout"
+
+@app.callback()
+def main(ctx: typer.Context, profile: str = typer.Option(None, help="Write cProfile stats of the command to this file (view with python -m pstats)"), metrics_json: str = typer.Option(None, help="Write per-phase timings (open, search, save, ...) as JSON to this file, or '-' for stderr"), trace_memory: str = typer.Option(None, help="Write the top Python memory allocations (tracemalloc) to this file")):
+    if metrics_json:
+        collector = metrics.collect()
+        spans = collector.__enter__()
+        ctx.call_on_close(lambda: metrics.write_json(metrics_json, spans, command=sys.argv[1:]))
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start(25)
+        ctx.call_on_close(lambda: write_memory_trace(trace_memory, tracemalloc.take_snapshot()))
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        ctx.call_on_close(lambda: (profiler.disable(), profiler.dump_stats(profile)))
+
+def write_memory_trace(path, snapshot, limit=30):
+    with open(path, "w", encoding="utf-8") as f:
+        for stat in snapshot.statistics("lineno")[:limit]:
+            f.write(f"{stat}\n")
+
 @app.command()
-def info(file_path: str):
-    """Show metadata and information about a PDF file."""
+def info(file_path: str, recursive: bool = typer.Option(False, "--recursive", "-r", help="Scan every PDF under a directory using the metadata catalog"), format: str = typer.Option("table", help="Output format for --recursive: table, json or csv"), output: str = typer.Option(None, help="Write --recursive results to this file instead of stdout"), db: str = typer.Option(None, help="Catalog database path (default: ~/.cache/doc-tor/catalog.sqlite)"), workers: int = typer.Option(None, help="Worker processes for new or changed files"), hash: bool = typer.Option(False, "--hash", help="Also match changed files by content hash"), cache: bool = typer.Option(False, "--cache", help="Reuse the result of an earlier run on identical content (see 'cache stats')")):
+    """Show metadata and information about a PDF file (or a whole directory)."""
     try:
-        data = pdf_ops.get_pdf_info(file_path)
+        if recursive:
+            show_catalog(file_path, format, output, db, workers, hash)
+            return
+        data = pdf_ops.get_pdf_info(stdin_or(file_path), cache=cache)
         table = Table(title=f"PDF Metadata: {os.path.basename(file_path)}")
         table.add_column("Property", style="cyan", no_wrap=True)
         table.add_column("Value", style="magenta")
@@ -21,115 +74,416 @@ def info(file_path: str):
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
+def show_catalog(root, format, output, db, workers, use_hash):
+    with console.status("[bold green]Scanning...") as status:
+        rows = catalog.scan(root, db, workers=workers, use_hash=use_hash, on_progress=lambda done, total: status.update(f"[bold green]Reading changed files... {done}/{total}"))
+    
+    if format == "table":
+        table = Table(title=f"PDF Catalog: {root} ({len(rows)} files)")
+        for column in ("Path", "Pages", "Title", "Author", "Encrypted"):
+            table.add_column(column, style="cyan" if column == "Path" else "magenta")
+        for row in rows:
+            if "error" in row:
+                table.add_row(os.path.relpath(row["path"], root), f"[red]{row['error']}[/red]", "", "", "")
+            else:
+                table.add_row(os.path.relpath(row["path"], root), str(row["pages"]), row["title"] or "", row["author"] or "", str(row["encrypted"]))
+        console.print(table)
+        return
+    
+    f = open(output, "w", encoding="utf-8", newline="") if output else sys.stdout
+    try:
+        if format == "json":
+            json.dump(rows, f, indent=2)
+            f.write("\n")
+        elif format == "csv":
+            fields = list(dict.fromkeys(k for row in rows for k in row))
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            raise typer.BadParameter(f"Unknown format '{format}'. Use table, json or csv.")
+    finally:
+        if output:
+            f.close()
+
 @app.command()
-def extract(file_path: str, output: str = typer.Option(None, help="Output text file path")):
+def extract(file_path: str, output: str = typer.Option(None, help="Output text file path"), workers: int = typer.Option(1, help="Number of worker processes to extract pages with"), stdout: bool = typer.Option(False, "--stdout", help="Same as --output -: stream page text to stdout"), mode: str = typer.Option("text", help="Extraction mode: text, blocks or words"), pages: str = typer.Option(None, help="Pages to process, e.g. '1,3-5,10-', 'odd', '-1' (default: all)"), ocr: bool = typer.Option(False, "--ocr", help="OCR scanned pages (no text layer) first; needs Tesseract"), ocr_language: str = typer.Option("eng", help="Tesseract language(s) for --ocr, e.g. 'eng+deu'"), cache: bool = typer.Option(False, "--cache", help="Reuse the result of an earlier run on identical content (see 'cache stats')")):
     """Extract text from a PDF file."""
     try:
+        source, output = stdio(file_path, "-" if stdout else output)
         with console.status("[bold green]Extracting text..."):
-            saved_path = pdf_ops.extract_text_from_pdf(file_path, output)
-        console.print(f"[bold green]Success![/bold green] Text extracted to '{saved_path}'")
+            saved_path = pdf_ops.extract_text_from_pdf(source, output, workers=workers, mode=mode, pages=pages, ocr=ocr and ocr_language, cache=cache)
+        console.print(f"[bold green]Success![/bold green] Text extracted to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def merge(files: list[str], output: str = typer.Option("merged.pdf", help="Output PDF file path")):
+def merge(files: list[str] = typer.Argument(None), output: str = typer.Option("merged.pdf", help="Output PDF file path"), manifest: str = typer.Option(None, help="File listing the PDFs to merge, one per line ('-' for stdin)"), batch_size: int = typer.Option(None, help="Append this many files at a time, which bounds memory whatever the number of files"), workers: int = typer.Option(1, help="Worker processes for --batch-size merges"), dedupe: bool = typer.Option(False, "--dedupe", help="Store fonts and images shared by the inputs only once (rewrites the whole output in memory)"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
     """Merge multiple PDF files into one."""
+    files = list(files or [])
+    if manifest:
+        files += pdf_ops.read_manifest(manifest)
     if len(files) < 2:
         console.print("[bold red]Error:[/bold red] Please provide at least two files.")
         return
     try:
-        with console.status("[bold green]Merging files..."):
-            saved_path = pdf_ops.merge_pdfs(files, output)
-        console.print(f"[bold green]Success![/bold green] Merged to '{saved_path}'")
+        _, output = stdio(None, output)
+        with console.status(f"[bold green]Merging {len(files)} files..."):
+            skipped, saved_path = pdf_ops.merge_pdfs(files, output, batch_size=batch_size, workers=workers, dedupe=dedupe, optimize=optimize)
+        for file, reason in skipped:
+            console.print(f"[yellow]Skipped '{file}': {reason}[/yellow]")
+        console.print(f"[bold green]Success![/bold green] Merged {len(files) - len(skipped)} files to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def redact(file_path: str, text: str, output: str = typer.Option(None, help="Output PDF file path")):
+def redact(file_path: str, text: str = typer.Argument(None, help="Text to redact"), term: list[str] = typer.Option(None, help="Additional text to redact (repeatable)"), terms_file: str = typer.Option(None, help="File with one term per line"), regex: list[str] = typer.Option(None, help="Regular expression to redact (repeatable)"), use_index: bool = typer.Option(False, "--use-index", help="Only scan pages the search index (cli.py index) lists for the terms"), index_db: str = typer.Option(None, help="Search index database path"), pages: str = typer.Option(None, help="Pages to process, e.g. '1,3-5,10-', 'odd', '-1' (default: all)"), output: str = typer.Option(None, help="Output PDF file path"), in_place: bool = typer.Option(False, "--in-place", help="Overwrite the input file"), incremental: bool = typer.Option(False, help="With --in-place, append only changed objects instead of rewriting the file"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output"), ocr: bool = typer.Option(False, "--ocr", help="OCR scanned pages (no text layer) first; needs Tesseract"), ocr_language: str = typer.Option("eng", help="Tesseract language(s) for --ocr, e.g. 'eng+deu'")):
     """Redact (black out) specific text in the PDF."""
     try:
-        with console.status(f"[bold green]Redacting '{text}'..."):
-            count, saved_path = pdf_ops.redact_pdf(file_path, text, output)
+        terms = ([text] if text else []) + (term or [])
+        if terms_file:
+            terms += pdf_ops.load_terms(terms_file)
+        if not terms and not regex:
+            console.print("[bold red]Error:[/bold red] Provide text, --term, --terms-file or --regex.")
+            return
+        label = f"'{terms[0]}'" if len(terms) == 1 and not regex else f"{len(terms) + len(regex or [])} terms"
+        source, output = stdio(file_path, output)
+        with console.status(f"[bold green]Redacting {label}..."):
+            count, saved_path = pdf_ops.redact_pdf(source, terms, output, regexes=regex, in_place=in_place, incremental=incremental, pages=pages, optimize=optimize, index_db=(index_db or True) if use_index else None, ocr=ocr and ocr_language)
         if count == 0:
-            console.print(f"[yellow]No instances of '{text}' found.[/yellow]")
+            console.print(f"[yellow]No instances of {label} found.[/yellow]")
         else:
-            console.print(f"[bold green]Success![/bold green] Redacted {count} occurrences. Saved to '{saved_path}'")
+            console.print(f"[bold green]Success![/bold green] Redacted {count} occurrences. Saved to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def edit(file_path: str, old_text: str, new_text: str, output: str = typer.Option(None, help="Output PDF file path")):
+def edit(file_path: str, old_text: str = typer.Argument(None), new_text: str = typer.Argument(None), pair: list[str] = typer.Option(None, help="Additional replacement as old=new (repeatable)"), pairs_file: str = typer.Option(None, help="File with one tab-separated old/new pair per line"), use_index: bool = typer.Option(False, "--use-index", help="Only scan pages the search index (cli.py index) lists for the terms"), index_db: str = typer.Option(None, help="Search index database path"), pages: str = typer.Option(None, help="Pages to process, e.g. '1,3-5,10-', 'odd', '-1' (default: all)"), output: str = typer.Option(None, help="Output PDF file path"), in_place: bool = typer.Option(False, "--in-place", help="Overwrite the input file"), incremental: bool = typer.Option(False, help="With --in-place, append only changed objects instead of rewriting the file"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output"), ocr: bool = typer.Option(False, "--ocr", help="OCR scanned pages (no text layer) first; needs Tesseract"), ocr_language: str = typer.Option("eng", help="Tesseract language(s) for --ocr, e.g. 'eng+deu'")):
     """Experimental: Search and replace text."""
     try:
-        with console.status(f"[bold green]Replacing '{old_text}'..."):
-            count, saved_path = pdf_ops.edit_pdf_text(file_path, old_text, new_text, output)
-        console.print(f"[bold green]Success![/bold green] Replaced {count} occurrences. Saved to '{saved_path}'")
+        if old_text and new_text is None:
+            console.print("[bold red]Error:[/bold red] Provide NEW_TEXT to replace OLD_TEXT with.")
+            return
+        pairs = [(old_text, new_text)] if old_text else []
+        for p in pair or []:
+            old, sep, new = p.partition("=")
+            if not sep:
+                raise typer.BadParameter(f"Expected old=new, got '{p}'")
+            pairs.append((old, new))
+        if pairs_file:
+            pairs += pdf_ops.load_replacements(pairs_file)
+        if not pairs:
+            console.print("[bold red]Error:[/bold red] Provide OLD_TEXT NEW_TEXT, --pair or --pairs-file.")
+            return
+        label = f"'{pairs[0][0]}'" if len(pairs) == 1 else f"{len(pairs)} terms"
+        source, output = stdio(file_path, output)
+        with console.status(f"[bold green]Replacing {label}..."):
+            count, saved_path = pdf_ops.edit_pdf_text(source, pairs, output_path=output, in_place=in_place, incremental=incremental, pages=pages, optimize=optimize, index_db=(index_db or True) if use_index else None, ocr=ocr and ocr_language)
+        console.print(f"[bold green]Success![/bold green] Replaced {count} occurrences. Saved to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def pdf_to_word(file_path: str, output: str = typer.Option(None, help="Output Word (.docx) file path")):
+def pdf_to_word(file_path: str, output: str = typer.Option(None, help="Output Word (.docx) file path"), workers: int = typer.Option(1, help="Convert page chunks in this many worker processes"), chunk_size: int = typer.Option(None, help="Pages per chunk (chunks are checkpointed, so a rerun resumes)"), cache: bool = typer.Option(False, "--cache", help="Reuse the result of an earlier run on identical content (see 'cache stats')")):
     """Convert PDF to a Word Document (.docx) for full editing."""
     try:
-        with console.status("[bold green]Converting PDF to Word..."):
-            saved_path = pdf_ops.convert_pdf_to_word(file_path, output)
-        console.print(f"[bold green]Success![/bold green] Converted to '{saved_path}'")
+        source, output = stdio(file_path, output)
+        with console.status("[bold green]Converting PDF to Word...") as status:
+            def on_progress(done, total):
+                status.update(f"[bold green]Converting PDF to Word... chunk {done}/{total}")
+            saved_path = pdf_ops.convert_pdf_to_word(source, output, workers=workers, chunk_size=chunk_size, on_progress=on_progress, cache=cache)
+        console.print(f"[bold green]Success![/bold green] Converted to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def word_to_pdf(file_path: str, output: str = typer.Option(None, help="Output PDF file path")):
-    """Convert a Word Document (.docx) back to PDF."""
+def word_to_pdf(file_path: str, output: str = typer.Option(None, help="Output PDF file path (or directory when converting a directory)"), backend: str = typer.Option("auto", help="Converter: auto, docx2pdf (MS Word) or libreoffice (headless)"), workers: int = typer.Option(None, help="LibreOffice worker processes for directory conversion"), timeout: int = typer.Option(120, help="Seconds allowed per document before the worker is recycled")):
+    """Convert a Word Document (.docx) back to PDF, or every document in a directory."""
     try:
+        if os.path.isdir(file_path):
+            with console.status("[bold green]Converting Word documents to PDF..."):
+                results = pdf_ops.convert_words_to_pdf(file_path, output, backend=backend, workers=workers, timeout=timeout)
+            failed = [(src, error) for src, dest, error in results if error]
+            for src, error in failed:
+                console.print(f"[red]{src}:[/red] {error}")
+            console.print(f"[bold green]Success![/bold green] Converted {len(results) - len(failed)} of {len(results)} documents.")
+            return
         with console.status("[bold green]Converting Word to PDF..."):
-            saved_path = pdf_ops.convert_word_to_pdf(file_path, output)
+            saved_path = pdf_ops.convert_word_to_pdf(file_path, output, backend=backend, timeout=timeout)
         console.print(f"[bold green]Success![/bold green] Converted to '{saved_path}'")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def rotate(file_path: str, degrees: int = typer.Option(90, help="Rotation angle (90, 180, 270)"), output: str = typer.Option(None)):
-    """Rotate all pages in the PDF."""
+def optimize(file_path: str, output: str = typer.Option(None), image_dpi: int = typer.Option(None, help="Downsample images above 1.5x this resolution to it"), image_quality: int = typer.Option(None, help="Recompress images as JPEG at this quality (1-100)"), in_place: bool = typer.Option(False, "--in-place", help="Overwrite the input file")):
+    """Shrink a PDF: dedupe fonts and images, drop unused objects, compress streams."""
+    try:
+        source, output = stdio(file_path, output)
+        with console.status("[bold green]Optimizing..."):
+            before, after, saved_path = pdf_ops.optimize_pdf(source, output, image_dpi=image_dpi, image_quality=image_quality, in_place=in_place)
+        if after is None:
+            console.print(f"[bold green]Success![/bold green] Optimized {format_size(before)}. Saved to {where(saved_path)}")
+            return
+        saved = 100 * (before - after) / before if before else 0
+        console.print(f"[bold green]Success![/bold green] {format_size(before)} -> {format_size(after)} ({saved:.1f}% smaller). Saved to {where(saved_path)}")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@app.command(name="ocr")
+def ocr_command(file_path: str, output: str = typer.Option(None), pages: str = typer.Option(None, help="Pages to process, e.g. '1,3-5,10-', 'odd', '-1' (default: all)"), language: str = typer.Option("eng", help="Tesseract language(s), e.g. 'eng+deu'"), dpi: int = typer.Option(300, help="Resolution the pages are OCRed at"), workers: int = typer.Option(None, help="Worker processes running OCR (default: CPU count)"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
+    """Make scanned pages searchable by adding an invisible OCR text layer."""
+    try:
+        source, output = stdio(file_path, output)
+        with console.status("[bold green]Running OCR..."):
+            count, saved_path = pdf_ops.ocr_pdf(source, output, pages=pages, language=language, dpi=dpi, workers=workers, optimize=optimize)
+        if count == 0:
+            console.print("[yellow]No pages without a text layer found.[/yellow]")
+        else:
+            console.print(f"[bold green]Success![/bold green] OCRed {count} pages. Saved to {where(saved_path)}")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@app.command()
+def render(file_path: str, pages: str = typer.Option(None, help="Pages to render, e.g. '1-3,-1' (default: all)"), dpi: int = typer.Option(150, help="Resolution in dots per inch"), format: str = typer.Option("png", help="Image format: png, jpeg or webp"), thumbnail: int = typer.Option(None, help="Render thumbnails with this longest edge in pixels"), output_dir: str = typer.Option(None, help="Directory for the images"), workers: int = typer.Option(1, help="Worker processes rendering pages"), cache: bool = typer.Option(False, "--cache", help="Keep rendered images in ~/.cache/doc-tor/renders and reuse them for the same file (never evicted)")):
+    """Render pages to images (or thumbnails)."""
+    try:
+        with console.status("[bold green]Rendering pages..."):
+            saved = pdf_ops.render_pages(stdin_or(file_path), pages, dpi=dpi, fmt=format, output_dir=output_dir, workers=workers, thumbnail=thumbnail, cache_dir=pdf_ops.DEFAULT_RENDER_CACHE if cache else None)
+        console.print(f"[bold green]Success![/bold green] Rendered {len(saved)} pages to '{os.path.dirname(saved[0]) if saved else output_dir}'")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@app.command()
+def rotate(file_path: str, degrees: int = typer.Option(90, help="Rotation angle (90, 180, 270)"), pages: str = typer.Option(None, help="Pages to process, e.g. '1,3-5,10-', 'odd', '-1' (default: all)"), output: str = typer.Option(None), in_place: bool = typer.Option(False, "--in-place", help="Overwrite the input file"), incremental: bool = typer.Option(False, help="With --in-place, append only changed objects instead of rewriting the file"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
+    """Rotate all (or the selected) pages in the PDF."""
     try:
-        saved_path = pdf_ops.rotate_pages(file_path, degrees, output)
-        console.print(f"[bold green]Success![/bold green] Rotated by {degrees} degrees. Saved to '{saved_path}'")
+        source, output = stdio(file_path, output)
+        saved_path = pdf_ops.rotate_pages(source, degrees, output, in_place=in_place, incremental=incremental, pages=pages, optimize=optimize)
+        console.print(f"[bold green]Success![/bold green] Rotated by {degrees} degrees. Saved to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def delete_pages(file_path: str, pages: str = typer.Option(..., help="Pages to delete (e.g. '1,3,5')"), output: str = typer.Option(None)):
+def delete_pages(file_path: str, pages: str = typer.Option(..., help="Pages to delete (e.g. '1,3-5', 'even', '-1')"), output: str = typer.Option(None), in_place: bool = typer.Option(False, "--in-place", help="Overwrite the input file"), incremental: bool = typer.Option(False, help="With --in-place, append only changed objects instead of rewriting the file"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
     """Delete specific pages from the PDF."""
     try:
-        page_list = [int(p.strip()) - 1 for p in pages.split(",")] # Convert to 0-based
-        saved_path = pdf_ops.delete_pages(file_path, page_list, output)
-        console.print(f"[bold green]Success![/bold green] Deleted pages. Saved to '{saved_path}'")
+        source, output = stdio(file_path, output)
+        saved_path = pdf_ops.delete_pages(source, pages, output, in_place=in_place, incremental=incremental, optimize=optimize)
+        console.print(f"[bold green]Success![/bold green] Deleted pages. Saved to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def split(file_path: str, start: int, end: int, output: str = typer.Option(None)):
-    """Extract a range of pages to a new file."""
+def split(file_path: str, start: int = typer.Argument(None), end: int = typer.Argument(None), pages: str = typer.Option(None, help="Page selection instead of START END, e.g. '1-3,7,10-'"), output: str = typer.Option(None), every: int = typer.Option(None, help="Write one file per N pages"), ranges: str = typer.Option(None, help="Write one file per range, separated by ';' (e.g. '1-3;4-10;11-')"), by_toc: int = typer.Option(None, help="Write one file per bookmark at this TOC level"), burst: bool = typer.Option(False, help="Write one file per page"), output_dir: str = typer.Option(None, help="Directory for the split files"), workers: int = typer.Option(1, help="Worker processes writing the split files"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
+    """Extract a range of pages to a new file, or split the PDF into many files."""
     try:
-        saved_path = pdf_ops.extract_page_range(file_path, start, end, output)
-        console.print(f"[bold green]Success![/bold green] Extracted pages {start}-{end}. Saved to '{saved_path}'")
+        if every or ranges or by_toc is not None or burst:
+            with console.status("[bold green]Splitting..."):
+                saved = pdf_ops.split_pdf(stdin_or(file_path), output_dir, every=every, ranges=ranges.split(";") if ranges else None, toc_level=by_toc, workers=workers, optimize=optimize)
+            console.print(f"[bold green]Success![/bold green] Wrote {len(saved)} files to '{os.path.dirname(saved[0]) or '.'}'")
+            return
+        if pages is None:
+            if start is None or end is None:
+                console.print("[bold red]Error:[/bold red] Provide START END, --pages, or a split mode (--every, --ranges, --by-toc, --burst).")
+                return
+            pages = f"{start}-{end}"
+        source, output = stdio(file_path, output)
+        saved_path = pdf_ops.extract_pages(source, pages, output, optimize=optimize)
+        console.print(f"[bold green]Success![/bold green] Extracted pages {pages}. Saved to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def encrypt(file_path: str, password: str, output: str = typer.Option(None)):
+def encrypt(file_path: str, password: str, output: str = typer.Option(None), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
     """Protect PDF with a password."""
     try:
-        saved_path = pdf_ops.encrypt_pdf(file_path, password, output)
-        console.print(f"[bold green]Success![/bold green] Encrypted file saved to '{saved_path}'")
+        source, output = stdio(file_path, output)
+        saved_path = pdf_ops.encrypt_pdf(source, password, output, optimize=optimize)
+        console.print(f"[bold green]Success![/bold green] Encrypted file saved to {where(saved_path)}")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
 @app.command()
-def decrypt(file_path: str, password: str, output: str = typer.Option(None)):
+def decrypt(file_path: str, password: str, output: str = typer.Option(None), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
     """Remove password protection from PDF."""
     try:
-        saved_path = pdf_ops.decrypt_pdf(file_path, password, output)
-        console.print(f"[bold green]Success![/bold green] Decrypted file saved to '{saved_path}'")
+        source, output = stdio(file_path, output)
+        saved_path = pdf_ops.decrypt_pdf(source, password, output, optimize=optimize)
+        console.print(f"[bold green]Success![/bold green] Decrypted file saved to {where(saved_path)}")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+def parse_step(step):
+    """Parse a --step value such as 'rotate:90', 'rotate:90@odd', 'delete:2,5', 'extract:3-7', 'edit:old=new'."""
+    name, _, arg = step.partition(":")
+    if name == "rotate":
+        degrees, _, pages = arg.partition("@")
+        return "rotate", (int(degrees), pages or None)
+    if name == "delete":
+        return "delete", (arg,)
+    if name == "extract":
+        return "select", (arg,)
+    if name == "edit":
+        old, sep, new = arg.partition("=")
+        if not sep:
+            raise typer.BadParameter(f"Expected edit:OLD=NEW, got '{step}'")
+        return "edit", (old, new)
+    if name in ("redact", "encrypt", "decrypt"):
+        return name, (arg,)
+    raise typer.BadParameter(f"Unknown step '{name}'")
+
+@app.command()
+def run(file_path: str, step: list[str] = typer.Option(..., help="Step to apply, in order (e.g. rotate:90, rotate:90@1-3, delete:2,5, extract:3-7, redact:SSN, edit:old=new, encrypt:pw, decrypt:pw)"), output: str = typer.Option(None), in_place: bool = typer.Option(False, "--in-place", help="Overwrite the input file"), incremental: bool = typer.Option(False, help="With --in-place, append only changed objects instead of rewriting the file"), optimize: bool = typer.Option(False, "--optimize", help="Dedupe, garbage-collect and compress the output")):
+    """Apply several operations in one pass, loading and saving the PDF once."""
+    try:
+        steps = [parse_step(s) for s in step]
+        source, output = stdio(file_path, output)
+        with console.status(f"[bold green]Running {len(steps)} steps..."):
+            counts, saved_path = pdf_ops.run_pipeline(source, steps, output, in_place=in_place, incremental=incremental, optimize=optimize)
+        for name, count in counts.items():
+            console.print(f"{name.title()}: {count} occurrences")
+        console.print(f"[bold green]Success![/bold green] Saved to {where(saved_path)}")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+def parse_params(params):
+    """Turn ['key=value', ...] into kwargs; values are read as JSON when possible (90, [0, 2], true)."""
+    kwargs = {}
+    for param in params or []:
+        key, sep, value = param.partition("=")
+        if not sep:
+            raise typer.BadParameter(f"Expected key=value, got '{param}'")
+        try:
+            kwargs[key.replace("-", "_")] = json.loads(value)
+        except ValueError:
+            kwargs[key.replace("-", "_")] = value
+    # A lone page number such as pages=3 is a page spec, not an index list
+    for key in ("pages", "pages_to_delete"):
+        if isinstance(kwargs.get(key), int):
+            kwargs[key] = str(kwargs[key])
+    return kwargs
+
+@app.command()
+def batch(operation: str, source: str, param: list[str] = typer.Option(None, help="Operation argument as key=value (repeatable), e.g. rotation=90"), workers: int = typer.Option(None, help="Worker processes (default: CPU count)"), checkpoint: str = typer.Option(None, help="Progress file used to resume an interrupted batch"), output_dir: str = typer.Option(None, help="Directory for output files"), report: str = typer.Option(None, help="Write the full JSON summary to this file")):
+    """Run an operation over a directory, glob or manifest of PDF files."""
+    try:
+        files = pdf_ops.collect_inputs(source)
+        if not files:
+            console.print(f"[yellow]No files matched '{source}'.[/yellow]")
+            return
+        with console.status(f"[bold green]Running '{operation}' on {len(files)} files...") as status:
+            progress = {"done": 0}
+            def on_result(entry):
+                progress["done"] += 1
+                status.update(f"[bold green]Running '{operation}'... {progress['done']}/{len(files)}")
+            summary = pdf_ops.run_batch(files, operation, parse_params(param), workers=workers, checkpoint=checkpoint, output_dir=output_dir, on_result=on_result)
+        
+        table = Table(title=f"Batch '{operation}'")
+        table.add_column("Total", style="cyan")
+        table.add_column("Succeeded", style="green")
+        table.add_column("Failed", style="red")
+        table.add_column("Skipped (checkpoint)", style="magenta")
+        table.add_row(str(summary["total"]), str(summary["succeeded"]), str(summary["failed"]), str(summary["skipped"]))
+        console.print(table)
+        for entry in summary["results"]:
+            if entry["status"] != "ok":
+                console.print(f"[red]{entry['file']}:[/red] {entry['error']}")
+        if report:
+            with open(report, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, default=str)
+            console.print(f"Report saved to '{report}'")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@app.command()
+def index(directory: str, db: str = typer.Option(None, help="Index database path (default: ~/.cache/doc-tor/search.sqlite)"), workers: int = typer.Option(None, help="Worker processes extracting new or changed files")):
+    """Build or update the full-text search index for every PDF under a directory."""
+    try:
+        with console.status("[bold green]Indexing...") as status:
+            indexed, unchanged, removed, failed = search_index.build_index(directory, db, workers=workers, on_progress=lambda done, total: status.update(f"[bold green]Indexing changed files... {done}/{total}"))
+        for path, error in failed:
+            console.print(f"[red]{path}:[/red] {error}")
+        console.print(f"[bold green]Success![/bold green] Indexed {indexed} files ({unchanged} unchanged, {removed} removed, {len(failed)} failed).")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@app.command()
+def search(query: str, db: str = typer.Option(None, help="Index database path"), limit: int = typer.Option(50, help="Maximum number of hits"), path: str = typer.Option(None, help="Only return hits under this directory"), as_json: bool = typer.Option(False, "--json", help="Print hits (with bounding boxes) as JSON")):
+    """Search the full-text index (terms of 3+ characters, FTS5 query syntax)."""
+    try:
+        hits = search_index.search(query, db, limit=limit, path_prefix=path)
+        if as_json:
+            sys.stdout.write(json.dumps(hits, indent=2) + "\n")
+            return
+        if not hits:
+            console.print(f"[yellow]No matches for '{query}'.[/yellow]")
+            return
+        table = Table(title=f"Search: {query}")
+        table.add_column("File", style="cyan")
+        table.add_column("Page", style="magenta")
+        table.add_column("Match")
+        for hit in hits:
+            table.add_row(hit["path"], str(hit["page"]), hit["snippet"])
+        console.print(table)
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+cache_app = typer.Typer(help="Inspect or empty the result cache used by --cache.")
+app.add_typer(cache_app, name="cache")
+
+@cache_app.command("stats")
+def cache_stats(as_json: bool = typer.Option(False, "--json", help="Print the statistics as JSON")):
+    """Show entries, size and hit rate of the result cache."""
+    try:
+        stats = result_cache.ResultCache().stats()
+        if as_json:
+            print(json.dumps(stats, indent=2))
+            return
+        table = Table(title=f"Result Cache: {stats['cache_dir']}")
+        table.add_column("Operation", style="cyan")
+        for column in ("Entries", "Size", "Hits"):
+            table.add_column(column, style="magenta", justify="right")
+        for op, row in stats["operations"].items():
+            table.add_row(op, str(row["entries"]), format_size(row["bytes"]), str(row["hits"]))
+        console.print(table)
+        hit_rate = f"{stats['hit_rate']:.0%}" if stats["hit_rate"] is not None else "n/a"
+        console.print(f"{stats['entries']} entries, {format_size(stats['bytes'])} of {format_size(stats['max_bytes'])}. "
+                      f"Hits: {stats['hits']}, misses: {stats['misses']} (hit rate {hit_rate}), evictions: {stats['evictions']}")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@cache_app.command("clear")
+def cache_clear():
+    """Delete every cached result and reset the statistics."""
+    try:
+        removed = result_cache.ResultCache().clear()
+        console.print(f"[bold green]Success![/bold green] Removed {removed} cached results.")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@app.command()
+def serve(host: str = typer.Option("127.0.0.1", help="Address to listen on"), port: int = typer.Option(8765, help="TCP port"), socket: str = typer.Option(None, help="Listen on this Unix socket instead of TCP"), workers: int = typer.Option(None, help="Worker processes (default: CPU count)"), max_concurrency: int = typer.Option(None, help="Requests processed at once (default: workers)"), max_pending: int = typer.Option(64, help="Requests allowed to wait for a slot before new ones get 503"), doc_cache: int = typer.Option(16, help="Open documents kept per worker"), allow_writes: bool = typer.Option(False, "--allow-writes", help="Also serve operations that write files (rotate, redact, render, ...)"), root: str = typer.Option(None, help="Only accept paths inside this directory (default with --allow-writes: the current directory)")):
+    """Run a local JSON API that keeps workers and open documents warm between requests."""
+    import asyncio
+    import server
+    if allow_writes and root is None:
+        root = os.getcwd()
+    app_server = server.Server(workers=workers, max_concurrency=max_concurrency, max_pending=max_pending, doc_cache_size=doc_cache, allow_writes=allow_writes, root=root)
+    where = socket or f"http://{host}:{port}"
+    try:
+        asyncio.run(app_server.serve(host, port, socket, on_ready=lambda _: console.print(f"[bold green]Serving[/bold green] on {where} with {app_server.workers} workers. Press Ctrl+C to stop.")))
+    except KeyboardInterrupt:
+        console.print("Stopped.")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+
+@app.command()
+def call(operation: str, file_path: str, param: list[str] = typer.Option(None, help="Operation argument as key=value (repeatable), e.g. pages=1-3"), url: str = typer.Option(None, help="Server URL (default: http://127.0.0.1:8765)"), socket: str = typer.Option(None, help="Server Unix socket")):
+    """Run an operation on a running `serve` instance and print the JSON result."""
+    import server
+    try:
+        result = server.call(operation, {"file_path": file_path, **parse_params(param)}, url=url, socket_path=socket)
+        sys.stdout.write(json.dumps(result, indent=2) + "\n")
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
 
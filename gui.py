@@ -1,12 +1,271 @@
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
 import pdf_ops
 import os
+import queue
+import subprocess
+import sys
 import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from jobs import JobManager
 
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
 
+def open_path(path):
+    """Open a file with the platform's default application."""
+    if sys.platform == "win32":
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+class ThumbnailRenderer(threading.Thread):
+    """Background thread feeding a single worker process that holds the document open.
+
+    PyMuPDF is not thread-safe, so the rendering happens in that process rather than
+    next to the job thread; this thread only hands it requests. It renders only the
+    pages most recently requested, so pages scrolled past quickly are never rendered.
+    """
+
+    def __init__(self, file_path, max_width, max_height, results):
+        super().__init__(daemon=True)
+        self.file_path = file_path
+        self.size = (max_width, max_height)
+        self.results = results
+        self.pending = []
+        self.stopped = False
+        self.cond = threading.Condition()
+        self.pool = ProcessPoolExecutor(max_workers=1)
+
+    def open(self):
+        """Open the document in the worker process and return its page count."""
+        try:
+            return self.pool.submit(pdf_ops._open_thumbnail_doc, self.file_path).result()
+        except BaseException:
+            self.pool.shutdown(wait=False)
+            raise
+
+    def request(self, indices):
+        with self.cond:
+            self.pending = list(indices)
+            self.cond.notify()
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+
+    def run(self):
+        try:
+            while True:
+                with self.cond:
+                    while not self.pending and not self.stopped:
+                        self.cond.wait()
+                    if self.stopped:
+                        return
+                    index = self.pending.pop(0)
+                try:
+                    png = self.pool.submit(pdf_ops._worker_thumbnail, index, *self.size).result()
+                except Exception:
+                    png = None
+                self.results.put((self, index, png))
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+class ThumbnailStrip(ctk.CTkFrame):
+    """Scrollable column of page thumbnails that scales to very long documents.
+
+    Only the rows in view (plus a small margin) exist as canvas items, and only those
+    pages are rendered, in a background process. Rendered images are kept in an LRU cache
+    bounded by cache_mb. Click toggles a page, shift-click selects a range, and
+    on_select(indices) is called with the sorted selection.
+    """
+
+    THUMB_WIDTH = 120
+    THUMB_HEIGHT = 160
+    ROW_HEIGHT = THUMB_HEIGHT + 34
+    OVERSCAN = 2
+
+    def __init__(self, master, on_select=None, cache_mb=64, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+        self.cache_bytes = cache_mb * 1024 * 1024
+        self.canvas = tk.Canvas(self, width=self.THUMB_WIDTH + 40, highlightthickness=0, bg=self._colors()[0])
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Shift-Button-1>", self._on_shift_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll(1))
+        self.results = queue.Queue()
+        self.renderer = None
+        self.page_count = 0
+        self.images = OrderedDict()  # page index -> (PhotoImage, bytes)
+        self.image_bytes = 0
+        self.items = {}  # page index -> (frame, image, label) canvas items
+        self.visible = range(0)
+        self.selection = set()
+        self.anchor = None
+        self._redraw_pending = False
+        self.after(50, self._poll_results)
+
+    def _colors(self):
+        # (background, placeholder, selection)
+        if ctk.get_appearance_mode() == "Dark":
+            return "gray17", "gray30", "#1f6aa5"
+        return "gray92", "gray80", "#3b8ed0"
+
+    def load(self, file_path):
+        """Show the pages of file_path and clear the selection."""
+        if self.renderer:
+            self.renderer.stop()
+            self.renderer = None
+        renderer = ThumbnailRenderer(file_path, self.THUMB_WIDTH, self.THUMB_HEIGHT, self.results)
+        self.page_count = renderer.open()
+        self.canvas.delete("all")
+        self.items.clear()
+        self.images.clear()
+        self.image_bytes = 0
+        self.selection.clear()
+        self.anchor = None
+        self.visible = range(0)
+        self.canvas.configure(scrollregion=(0, 0, self.THUMB_WIDTH + 40, self.page_count * self.ROW_HEIGHT))
+        self.canvas.yview_moveto(0)
+        self.renderer = renderer
+        self.renderer.start()
+        self.schedule_redraw()
+        self._notify()
+
+    def destroy(self):
+        if self.renderer:
+            self.renderer.stop()
+        super().destroy()
+
+    def set_selection(self, indices):
+        self.selection = {i for i in indices if 0 <= i < self.page_count}
+        for index in self.items:
+            self._style(index)
+        self._notify()
+
+    def _notify(self):
+        if self.on_select:
+            self.on_select(sorted(self.selection))
+
+    def _scroll(self, units):
+        self.canvas.yview_scroll(units, "units")
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        # Coalesce the many scroll/resize events of one gesture into one redraw
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        if not self.page_count:
+            return
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(0, int(top // self.ROW_HEIGHT) - self.OVERSCAN)
+        last = min(self.page_count, int(bottom // self.ROW_HEIGHT) + 1 + self.OVERSCAN)
+        self.visible = range(first, last)
+        for index in [i for i in self.items if i not in self.visible]:
+            for item in self.items.pop(index):
+                self.canvas.delete(item)
+        for index in self.visible:
+            if index not in self.items:
+                self._create_row(index)
+        # Render what is on screen first, then the margin
+        on_screen = [i for i in self.visible if top <= i * self.ROW_HEIGHT + self.ROW_HEIGHT and i * self.ROW_HEIGHT <= bottom]
+        missing = [i for i in on_screen + list(self.visible) if i not in self.images]
+        if self.renderer:
+            self.renderer.request(dict.fromkeys(missing))
+
+    def _create_row(self, index):
+        y = index * self.ROW_HEIGHT
+        x = (self.THUMB_WIDTH + 40) // 2
+        background, placeholder, _ = self._colors()
+        frame = self.canvas.create_rectangle(x - self.THUMB_WIDTH // 2 - 6, y + 4, x + self.THUMB_WIDTH // 2 + 6, y + self.THUMB_HEIGHT + 28, outline="", fill=background)
+        cached = self.images.get(index)
+        if cached:
+            self.images.move_to_end(index)
+            image = self.canvas.create_image(x, y + 10 + self.THUMB_HEIGHT // 2, image=cached[0])
+        else:
+            image = self.canvas.create_rectangle(x - self.THUMB_WIDTH // 2, y + 10, x + self.THUMB_WIDTH // 2, y + 10 + self.THUMB_HEIGHT, outline="", fill=placeholder)
+        label = self.canvas.create_text(x, y + self.THUMB_HEIGHT + 20, text=str(index + 1), fill="gray50")
+        self.items[index] = (frame, image, label)
+        self._style(index)
+
+    def _style(self, index):
+        frame = self.items[index][0]
+        selected = index in self.selection
+        self.canvas.itemconfigure(frame, fill=self._colors()[2] if selected else self._colors()[0])
+
+    def _poll_results(self):
+        try:
+            while True:
+                renderer, index, png = self.results.get_nowait()
+                if renderer is self.renderer and png:
+                    self._store(index, png)
+        except queue.Empty:
+            pass
+        self.after(50, self._poll_results)
+
+    def _store(self, index, png):
+        # PhotoImage must be created on the Tk thread; Tk 8.6 decodes PNG itself
+        photo = tk.PhotoImage(data=png)
+        size = photo.width() * photo.height() * 4
+        self.images[index] = (photo, size)
+        self.image_bytes += size
+        # Evict least recently used images that are not on screen
+        for old in list(self.images):
+            if self.image_bytes <= self.cache_bytes:
+                break
+            if old not in self.visible:
+                self.image_bytes -= self.images.pop(old)[1]
+        if index in self.items:
+            frame, placeholder, label = self.items[index]
+            self.canvas.delete(placeholder)
+            x = (self.THUMB_WIDTH + 40) // 2
+            image = self.canvas.create_image(x, index * self.ROW_HEIGHT + 10 + self.THUMB_HEIGHT // 2, image=photo)
+            self.items[index] = (frame, image, label)
+
+    def _index_at(self, event):
+        index = int(self.canvas.canvasy(event.y) // self.ROW_HEIGHT)
+        return index if 0 <= index < self.page_count else None
+
+    def _on_click(self, event):
+        index = self._index_at(event)
+        if index is None:
+            return
+        self.selection ^= {index}
+        self.anchor = index
+        if index in self.items:
+            self._style(index)
+        self._notify()
+
+    def _on_shift_click(self, event):
+        index = self._index_at(event)
+        if index is None:
+            return
+        start = index if self.anchor is None else self.anchor
+        self.selection |= set(range(min(start, index), max(start, index) + 1))
+        for i in self.items:
+            self._style(i)
+        self._notify()
+
 class PDFEditorApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -21,7 +280,7 @@ class PDFEditorApp(ctk.CTk):
         # Create Navigation Frame (Sidebar)
         self.sidebar_frame = ctk.CTkFrame(self, width=160, corner_radius=0)
         self.sidebar_frame.grid(row=0, column=0, rowspan=4, sticky="nsew")
-        self.sidebar_frame.grid_rowconfigure(8, weight=1)
+        self.sidebar_frame.grid_rowconfigure(9, weight=1)
 
         self.logo_label = ctk.CTkLabel(self.sidebar_frame, text="Doc-Tor", font=ctk.CTkFont(size=20, weight="bold"))
         self.logo_label.grid(row=0, column=0, padx=20, pady=(20, 10))
@@ -34,6 +293,9 @@ class PDFEditorApp(ctk.CTk):
         self.security_btn = self.create_nav_btn("Security", self.show_security, 5)
         self.merge_btn = self.create_nav_btn("Merge Files", self.show_merge, 6)
         self.extract_btn = self.create_nav_btn("Extract Text", self.show_extract, 7)
+        self.jobs_btn = self.create_nav_btn("Jobs", self.show_jobs, 8)
+        self.jobs_summary = ctk.CTkLabel(self.sidebar_frame, text="No jobs", text_color="gray")
+        self.jobs_summary.grid(row=10, column=0, padx=20, pady=(0, 20))
 
         # Main Content Frames
         self.home_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
@@ -43,6 +305,7 @@ class PDFEditorApp(ctk.CTk):
         self.security_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
         self.merge_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
         self.extract_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
+        self.jobs_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
 
         self.setup_home_frame()
         self.setup_word_frame()
@@ -51,6 +314,15 @@ class PDFEditorApp(ctk.CTk):
         self.setup_security_frame()
         self.setup_merge_frame()
         self.setup_extract_frame()
+        self.setup_jobs_frame()
+
+        # Operations run as background jobs; their updates are applied here, on the Tk thread.
+        # One job thread, since PyMuPDF is not thread-safe: jobs queue behind each other
+        self.jobs = JobManager(max_workers=1)
+        self.job_rows = {}
+        self.job_callbacks = {}
+        self.after(100, self.poll_jobs)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Default View
         self.select_frame_by_name("Home / Info")
@@ -62,11 +334,11 @@ class PDFEditorApp(ctk.CTk):
 
     def select_frame_by_name(self, name):
         # Reset buttons
-        for btn in [self.home_btn, self.word_btn, self.edit_btn, self.pages_btn, self.security_btn, self.merge_btn, self.extract_btn]:
+        for btn in [self.home_btn, self.word_btn, self.edit_btn, self.pages_btn, self.security_btn, self.merge_btn, self.extract_btn, self.jobs_btn]:
             btn.configure(fg_color="transparent")
 
         # Hide all frames
-        for frame in [self.home_frame, self.word_frame, self.edit_frame, self.pages_frame, self.security_frame, self.merge_frame, self.extract_frame]:
+        for frame in [self.home_frame, self.word_frame, self.edit_frame, self.pages_frame, self.security_frame, self.merge_frame, self.extract_frame, self.jobs_frame]:
             frame.grid_forget()
 
         # Show selected
@@ -77,7 +349,8 @@ class PDFEditorApp(ctk.CTk):
             "Page Tools": (self.pages_frame, self.pages_btn),
             "Security": (self.security_frame, self.security_btn),
             "Merge Files": (self.merge_frame, self.merge_btn),
-            "Extract Text": (self.extract_frame, self.extract_btn)
+            "Extract Text": (self.extract_frame, self.extract_btn),
+            "Jobs": (self.jobs_frame, self.jobs_btn)
         }
         
         frame, btn = frames[name]
@@ -91,6 +364,7 @@ class PDFEditorApp(ctk.CTk):
     def show_security(self): self.select_frame_by_name("Security")
     def show_merge(self): self.select_frame_by_name("Merge Files")
     def show_extract(self): self.select_frame_by_name("Extract Text")
+    def show_jobs(self): self.select_frame_by_name("Jobs")
 
     # --- HOME FRAME ---
     def setup_home_frame(self):
@@ -105,17 +379,19 @@ class PDFEditorApp(ctk.CTk):
     def load_pdf_info(self):
         filename = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
         if filename:
-            try:
-                info = pdf_ops.get_pdf_info(filename)
-                display_text = f"File: {os.path.basename(filename)}\n\n"
-                for k, v in info.items():
-                    display_text += f"{k.replace('_', ' ').title()}: {v}\n"
-                self.info_textbox.configure(state="normal")
-                self.info_textbox.delete("0.0", "end")
-                self.info_textbox.insert("0.0", display_text)
-                self.info_textbox.configure(state="disabled")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            # Read on the job thread, which owns every PyMuPDF call
+            self.run_job(f"Info: {os.path.basename(filename)}", lambda progress: pdf_ops.get_pdf_info(filename),
+                         describe=lambda info: self.show_pdf_info(filename, info))
+
+    def show_pdf_info(self, filename, info):
+        display_text = f"File: {os.path.basename(filename)}\n\n"
+        for k, v in info.items():
+            display_text += f"{k.replace('_', ' ').title()}: {v}\n"
+        self.info_textbox.configure(state="normal")
+        self.info_textbox.delete("0.0", "end")
+        self.info_textbox.insert("0.0", display_text)
+        self.info_textbox.configure(state="disabled")
+        return "Info loaded"
 
     # --- WORD CONVERSION FRAME ---
     def setup_word_frame(self):
@@ -129,29 +405,37 @@ class PDFEditorApp(ctk.CTk):
     def run_word_conversion(self):
         filename = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
         if not filename: return
-        self.run_threaded_task(lambda: pdf_ops.convert_pdf_to_word(filename), "Converting to Word...", self.word_status, self.word_progress, open_file=True)
+        task = lambda progress: pdf_ops.convert_pdf_to_word(filename, workers=os.cpu_count() or 1, on_progress=progress)
+        self.run_job(f"PDF to Word: {os.path.basename(filename)}", task, self.word_status, self.word_progress, open_file=True, on_progress=self.show_chunk_progress)
+
+    def show_chunk_progress(self, done, total):
+        if self.word_progress.cget("mode") != "determinate":
+            self.word_progress.stop()
+            self.word_progress.configure(mode="determinate")
+        self.word_progress.set(done / total if total else 1)
+        self.word_status.configure(text=f"Converting to Word... {done}/{total} chunks", text_color="orange")
 
     def run_pdf_conversion(self):
         filename = filedialog.askopenfilename(filetypes=[("Word Files", "*.docx")])
         if not filename: return
-        self.run_threaded_task(lambda: pdf_ops.convert_word_to_pdf(filename), "Converting to PDF...", self.word_status, self.word_progress)
-
-    def run_threaded_task(self, func, status_msg, status_label, progress_bar, open_file=False):
-        def task():
-            try:
-                progress_bar.pack(pady=10)
-                progress_bar.start()
-                status_label.configure(text=status_msg, text_color="orange")
-                path = func()
-                status_label.configure(text=f"Success: {os.path.basename(path)}", text_color="green")
-                if open_file: os.startfile(path)
-                else: messagebox.showinfo("Success", f"Saved to:\n{os.path.basename(path)}")
-            except Exception as e:
-                status_label.configure(text=f"Error: {str(e)}", text_color="red")
-            finally:
-                progress_bar.stop()
-                progress_bar.pack_forget()
-        threading.Thread(target=task).start()
+        self.run_job(f"Word to PDF: {os.path.basename(filename)}", lambda progress: pdf_ops.convert_word_to_pdf(filename), self.word_status, self.word_progress)
+
+    def run_job(self, title, func, status_label=None, progress_bar=None, open_file=False, on_progress=None, describe=None):
+        """Queue func(progress) as a background job and list it in the Jobs panel.
+
+        status_label and progress_bar, when given, also follow the job on the page it was
+        started from. describe(result) gives the text shown when the job succeeds.
+        """
+        job = self.jobs.submit(title, func)
+        self.add_job_row(job)
+        if progress_bar is not None:
+            progress_bar.configure(mode="indeterminate")
+            progress_bar.pack(pady=10)
+            progress_bar.start()
+        if status_label is not None:
+            status_label.configure(text=f"{title} (queued, see Jobs)", text_color="orange")
+        self.job_callbacks[job.id] = (status_label, progress_bar, open_file, on_progress, describe)
+        return job
 
     # --- PAGE TOOLS FRAME ---
     def setup_pages_frame(self):
@@ -163,59 +447,82 @@ class PDFEditorApp(ctk.CTk):
         self.pages_file_label = ctk.CTkLabel(self.pages_frame, text="No file selected")
         self.pages_file_label.pack(pady=5)
 
+        body = ctk.CTkFrame(self.pages_frame, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=20, pady=10)
+        # Page thumbnails are the main way to pick pages; the entry mirrors the selection
+        self.thumbnails = ThumbnailStrip(body, on_select=self.on_pages_selected)
+        self.thumbnails.pack(side="right", fill="y")
+        controls = ctk.CTkFrame(body, fg_color="transparent")
+        controls.pack(side="left", fill="both", expand=True)
+
+        # Selection
+        ctk.CTkLabel(controls, text="Selected Pages (click thumbnails, Shift+click for a range):").pack(pady=(5, 5))
+        self.pages_entry = ctk.CTkEntry(controls, placeholder_text="e.g. 1, 3-5 (empty = all pages)")
+        self.pages_entry.pack(pady=5, fill="x", padx=20)
+        self.pages_entry.bind("<Return>", lambda e: self.apply_pages_entry())
+        select_frame = ctk.CTkFrame(controls, fg_color="transparent")
+        select_frame.pack(pady=5)
+        ctk.CTkButton(select_frame, text="Select All", width=100, command=lambda: self.thumbnails.set_selection(range(self.thumbnails.page_count))).pack(side="left", padx=5)
+        ctk.CTkButton(select_frame, text="Clear", width=100, command=lambda: self.thumbnails.set_selection([])).pack(side="left", padx=5)
+
         # Rotate
-        ctk.CTkLabel(self.pages_frame, text="Rotate Pages:").pack(pady=(15, 5))
+        ctk.CTkLabel(controls, text="Rotate Selected Pages:").pack(pady=(15, 5))
         self.rotate_var = ctk.StringVar(value="90")
-        ctk.CTkComboBox(self.pages_frame, values=["90", "180", "270"], variable=self.rotate_var).pack(pady=5)
-        ctk.CTkButton(self.pages_frame, text="Rotate", command=self.run_rotate).pack(pady=5)
+        ctk.CTkComboBox(controls, values=["90", "180", "270"], variable=self.rotate_var).pack(pady=5)
+        ctk.CTkButton(controls, text="Rotate", command=self.run_rotate).pack(pady=5)
 
         # Delete
-        ctk.CTkLabel(self.pages_frame, text="Delete Pages (e.g. 1, 3-5):").pack(pady=(15, 5))
-        self.delete_entry = ctk.CTkEntry(self.pages_frame, placeholder_text="1, 3, 5")
-        self.delete_entry.pack(pady=5)
-        ctk.CTkButton(self.pages_frame, text="Delete Pages", command=self.run_delete, fg_color="red", hover_color="darkred").pack(pady=5)
+        ctk.CTkButton(controls, text="Delete Selected Pages", command=self.run_delete, fg_color="red", hover_color="darkred").pack(pady=(15, 5))
 
         # Split
-        ctk.CTkLabel(self.pages_frame, text="Extract Range (Split):").pack(pady=(15, 5))
-        split_frame = ctk.CTkFrame(self.pages_frame, fg_color="transparent")
-        split_frame.pack(pady=5)
-        self.split_start = ctk.CTkEntry(split_frame, width=60, placeholder_text="Start")
-        self.split_start.pack(side="left", padx=5)
-        self.split_end = ctk.CTkEntry(split_frame, width=60, placeholder_text="End")
-        self.split_end.pack(side="left", padx=5)
-        ctk.CTkButton(self.pages_frame, text="Extract Range", command=self.run_split).pack(pady=5)
+        ctk.CTkButton(controls, text="Extract Selected Pages (Split)", command=self.run_split).pack(pady=(15, 5))
 
     def select_pages_file(self):
         self.selected_pages_file = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
         if self.selected_pages_file:
             self.pages_file_label.configure(text=os.path.basename(self.selected_pages_file))
+            try:
+                self.thumbnails.load(self.selected_pages_file)
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def on_pages_selected(self, indices):
+        self.pages_entry.delete(0, "end")
+        if indices:
+            self.pages_entry.insert(0, pdf_ops.format_page_spec(indices))
+
+    def apply_pages_entry(self):
+        # Typed page specs update the thumbnail selection too
+        spec = self.pages_entry.get().strip()
+        try:
+            self.thumbnails.set_selection(pdf_ops.parse_page_spec(spec, self.thumbnails.page_count) if spec else [])
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
 
     def run_rotate(self):
         if not hasattr(self, 'selected_pages_file') or not self.selected_pages_file: return
-        try:
-            path = pdf_ops.rotate_pages(self.selected_pages_file, int(self.rotate_var.get()))
-            messagebox.showinfo("Success", f"Rotated file saved to:\n{os.path.basename(path)}")
-        except Exception as e: messagebox.showerror("Error", str(e))
+        file_path, rotation = self.selected_pages_file, int(self.rotate_var.get())
+        pages = self.pages_entry.get().strip() or None
+        self.run_job(f"Rotate {rotation}: {os.path.basename(file_path)}", lambda progress: pdf_ops.rotate_pages(file_path, rotation, pages=pages, on_progress=progress))
 
     def run_delete(self):
         if not hasattr(self, 'selected_pages_file') or not self.selected_pages_file: return
-        pages_str = self.delete_entry.get()
-        if not pages_str: return
-        try:
-            # Parse "1, 3, 5" -> [0, 2, 4]
-            page_list = [int(p.strip()) - 1 for p in pages_str.split(",")]
-            path = pdf_ops.delete_pages(self.selected_pages_file, page_list)
-            messagebox.showinfo("Success", f"Pages deleted. Saved to:\n{os.path.basename(path)}")
-        except Exception as e: messagebox.showerror("Error", str(e))
+        pages_str = self.pages_entry.get().strip()
+        if not pages_str:
+            messagebox.showwarning("Warning", "Select the pages to delete.")
+            return
+        file_path = self.selected_pages_file
+        # Page specs like "1, 3-5" are parsed by pdf_ops
+        self.run_job(f"Delete pages {pages_str}: {os.path.basename(file_path)}", lambda progress: pdf_ops.delete_pages(file_path, pages_str, on_progress=progress))
 
     def run_split(self):
         if not hasattr(self, 'selected_pages_file') or not self.selected_pages_file: return
-        try:
-            start = int(self.split_start.get())
-            end = int(self.split_end.get())
-            path = pdf_ops.extract_page_range(self.selected_pages_file, start, end)
-            messagebox.showinfo("Success", f"Range extracted. Saved to:\n{os.path.basename(path)}")
-        except Exception as e: messagebox.showerror("Error", str(e))
+        pages_str = self.pages_entry.get().strip()
+        if not pages_str:
+            messagebox.showwarning("Warning", "Select the pages to extract.")
+            return
+        file_path = self.selected_pages_file
+        self.run_job(f"Extract pages {pages_str}: {os.path.basename(file_path)}", lambda progress: pdf_ops.extract_pages(file_path, pages_str, on_progress=progress))
 
 
     # --- SECURITY FRAME ---
@@ -244,10 +551,8 @@ class PDFEditorApp(ctk.CTk):
         if not pwd: 
             messagebox.showwarning("Warning", "Enter a password.")
             return
-        try:
-            path = pdf_ops.encrypt_pdf(self.selected_security_file, pwd)
-            messagebox.showinfo("Success", f"Encrypted file saved to:\n{os.path.basename(path)}")
-        except Exception as e: messagebox.showerror("Error", str(e))
+        file_path = self.selected_security_file
+        self.run_job(f"Encrypt: {os.path.basename(file_path)}", lambda progress: pdf_ops.encrypt_pdf(file_path, pwd, on_progress=progress))
 
     def run_decrypt(self):
         if not hasattr(self, 'selected_security_file') or not self.selected_security_file: return
@@ -255,10 +560,8 @@ class PDFEditorApp(ctk.CTk):
         if not pwd: 
             messagebox.showwarning("Warning", "Enter a password.")
             return
-        try:
-            path = pdf_ops.decrypt_pdf(self.selected_security_file, pwd)
-            messagebox.showinfo("Success", f"Decrypted file saved to:\n{os.path.basename(path)}")
-        except Exception as e: messagebox.showerror("Error", str(e))
+        file_path = self.selected_security_file
+        self.run_job(f"Decrypt: {os.path.basename(file_path)}", lambda progress: pdf_ops.decrypt_pdf(file_path, pwd, on_progress=progress))
 
     # --- EDIT / REDACT FRAME ---
     def setup_edit_frame(self):
@@ -287,16 +590,15 @@ class PDFEditorApp(ctk.CTk):
         if not search_text:
             messagebox.showwarning("Warning", "Please enter text to search.")
             return
-        try:
-            if replace_text:
-                count, path = pdf_ops.edit_pdf_text(self.selected_edit_file, search_text, replace_text)
-                msg = f"Replaced {count} instances.\nSaved to: {os.path.basename(path)}"
-            else:
-                count, path = pdf_ops.redact_pdf(self.selected_edit_file, search_text)
-                msg = f"Redacted {count} instances.\nSaved to: {os.path.basename(path)}"
-            messagebox.showinfo("Success", msg)
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        file_path = self.selected_edit_file
+        if replace_text:
+            self.run_job(f"Replace '{search_text}': {os.path.basename(file_path)}",
+                         lambda progress: pdf_ops.edit_pdf_text(file_path, search_text, replace_text, on_progress=progress),
+                         describe=lambda result: f"Replaced {result[0]} instances. Saved to: {os.path.basename(result[1])}")
+        else:
+            self.run_job(f"Redact '{search_text}': {os.path.basename(file_path)}",
+                         lambda progress: pdf_ops.redact_pdf(file_path, search_text, on_progress=progress),
+                         describe=lambda result: f"Redacted {result[0]} instances. Saved to: {os.path.basename(result[1])}")
 
     # --- MERGE FRAME ---
     def setup_merge_frame(self):
@@ -326,11 +628,14 @@ class PDFEditorApp(ctk.CTk):
             return
         save_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF Files", "*.pdf")])
         if save_path:
-            try:
-                pdf_ops.merge_pdfs(self.merge_files, save_path)
-                messagebox.showinfo("Success", "Files merged successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            files = list(self.merge_files)
+            def describe(result):
+                skipped, path = result
+                msg = f"Merged {len(files) - len(skipped)} files into {os.path.basename(path)}."
+                if skipped:
+                    msg += " Skipped: " + ", ".join(f"{os.path.basename(f)} ({reason})" for f, reason in skipped)
+                return msg
+            self.run_job(f"Merge {len(files)} files", lambda progress: pdf_ops.merge_pdfs(files, save_path, on_progress=progress), describe=describe)
 
     # --- EXTRACT FRAME ---
     def setup_extract_frame(self):
@@ -343,12 +648,102 @@ class PDFEditorApp(ctk.CTk):
     def run_extract(self):
         filename = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
         if filename:
+            self.run_job(f"Extract text: {os.path.basename(filename)}", lambda progress: pdf_ops.extract_text_from_pdf(filename, on_progress=progress),
+                         self.extract_status, open_file=True, describe=lambda path: f"Extracted to: {os.path.basename(path)}")
+
+    # --- JOBS FRAME ---
+    def setup_jobs_frame(self):
+        ctk.CTkLabel(self.jobs_frame, text="Jobs", font=ctk.CTkFont(size=18, weight="bold")).pack(pady=20)
+        ctk.CTkButton(self.jobs_frame, text="Clear Finished", command=self.clear_finished_jobs).pack(pady=5)
+        self.jobs_list = ctk.CTkScrollableFrame(self.jobs_frame)
+        self.jobs_list.pack(pady=10, padx=20, fill="both", expand=True)
+
+    def add_job_row(self, job):
+        row = ctk.CTkFrame(self.jobs_list)
+        row.pack(fill="x", pady=4)
+        row.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(row, text=job.title, anchor="w").grid(row=0, column=0, padx=10, sticky="ew")
+        cancel_btn = ctk.CTkButton(row, text="Cancel", width=70, fg_color="red", hover_color="darkred", command=lambda: self.jobs.cancel(job.id))
+        cancel_btn.grid(row=0, column=1, rowspan=2, padx=10, pady=5)
+        status = ctk.CTkLabel(row, text="Queued", anchor="w", text_color="gray")
+        status.grid(row=1, column=0, padx=10, sticky="ew")
+        bar = ctk.CTkProgressBar(row, mode="determinate")
+        bar.set(0)
+        bar.grid(row=2, column=0, columnspan=2, padx=10, pady=(0, 8), sticky="ew")
+        self.job_rows[job.id] = (row, status, bar, cancel_btn)
+
+    def poll_jobs(self):
+        try:
+            for job in self.jobs.poll():
+                try:
+                    self.update_job(job)
+                except Exception as e:
+                    messagebox.showerror("Error", f"{job.title}: {e}")
+            counts = self.jobs.counts()
+            active = counts.get("running", 0) + counts.get("queued", 0)
+            self.jobs_summary.configure(text=f"{counts.get('running', 0)} running, {counts.get('queued', 0)} queued" if active else "No jobs running")
+        finally:
+            # Re-armed whatever happened above, or no later job would ever be shown
+            self.after(100, self.poll_jobs)
+
+    def update_job(self, job):
+        status_label, progress_bar, open_file, on_progress, describe = self.job_callbacks.get(job.id, (None, None, False, None, None))
+        if job.id in self.job_rows:
+            _, status, bar, cancel_btn = self.job_rows[job.id]
+            if job.status == "running":
+                if job.total:
+                    if bar.cget("mode") != "determinate":
+                        bar.stop()
+                        bar.configure(mode="determinate")
+                    bar.set(job.done / job.total)
+                    status.configure(text=f"Running... {job.done}/{job.total}", text_color="orange")
+                elif bar.cget("mode") != "indeterminate":
+                    bar.configure(mode="indeterminate")
+                    bar.start()
+                    status.configure(text="Running...", text_color="orange")
+        if job.status == "running":
+            if on_progress and job.total:
+                on_progress(job.done, job.total)
+            elif status_label is not None and not job.total:
+                status_label.configure(text=f"{job.title}...", text_color="orange")
+            return
+        if not job.finished:
+            return
+
+        if job.status == "done":
+            text, color = (describe(job.result) if describe else f"Saved to: {os.path.basename(job.result)}"), "green"
+        elif job.status == "failed":
+            text, color = f"Error: {job.error}", "red"
+        else:
+            text, color = "Cancelled", "gray"
+        if job.id in self.job_rows:
+            _, status, bar, cancel_btn = self.job_rows[job.id]
+            bar.stop()
+            bar.configure(mode="determinate")
+            bar.set(1 if job.status == "done" else 0)
+            status.configure(text=text, text_color=color)
+            cancel_btn.configure(state="disabled")
+        if status_label is not None:
+            status_label.configure(text=text, text_color=color)
+        if progress_bar is not None:
+            progress_bar.stop()
+            progress_bar.pack_forget()
+        self.job_callbacks.pop(job.id, None)
+        if open_file and job.status == "done":
             try:
-                path = pdf_ops.extract_text_from_pdf(filename)
-                self.extract_status.configure(text=f"Extracted to: {os.path.basename(path)}", text_color="green")
-                os.startfile(path)
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+                open_path(job.result)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not open {job.result}: {e}")
+
+    def clear_finished_jobs(self):
+        for job_id, job in list(self.jobs.jobs.items()):
+            if job.finished and job_id in self.job_rows:
+                self.job_rows.pop(job_id)[0].destroy()
+        self.jobs.clear_finished()
+
+    def on_close(self):
+        self.jobs.shutdown()
+        self.destroy()
 
 if __name__ == "__main__":
     app = PDFEditorApp()
@@ -0,0 +1,116 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """One queued operation. status: queued, running, done, failed or cancelled."""
+
+    def __init__(self, job_id, title):
+        self.id = job_id
+        self.title = title
+        self.status = "queued"
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+class JobManager:
+    """Run operations on a bounded pool of background threads.
+
+    Worker threads never touch widgets: every state change is put on a queue, and the
+    UI drains it with poll() from its own thread (e.g. from Tk's after() loop).
+
+    submit(title, func) runs func(progress), where progress(done, total) reports page
+    level progress and raises JobCancelled once the job has been cancelled. Passing it
+    as a pdf_ops on_progress callback therefore makes those operations cancellable
+    between pages.
+
+    The default is a single worker: PyMuPDF is not thread-safe, so pdf_ops jobs must
+    not run side by side in threads.
+    """
+
+    def __init__(self, max_workers=1):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="doctor-job")
+        self.events = queue.Queue()
+        self.jobs = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, title, func):
+        job = Job(next(self._ids), title)
+        self.jobs[job.id] = job
+        self.events.put(job)
+        self.executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job, func):
+        if job.cancelled:
+            job.status = "cancelled"
+            self.events.put(job)
+            return
+
+        def progress(done, total):
+            if job.cancelled:
+                raise JobCancelled()
+            job.done, job.total = done, total
+            self.events.put(job)
+
+        job.status = "running"
+        self.events.put(job)
+        try:
+            job.result = func(progress)
+            job.status = "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        self.events.put(job)
+
+    def cancel(self, job_id):
+        """Queued jobs never start; running jobs stop at their next progress report."""
+        job = self.jobs.get(job_id)
+        if job and not job.finished:
+            job._cancel.set()
+            if job.status == "queued":
+                job.status = "cancelled"
+                self.events.put(job)
+
+    def poll(self):
+        """Jobs that changed since the last poll, each once, in the order they changed."""
+        changed = {}
+        while True:
+            try:
+                job = self.events.get_nowait()
+            except queue.Empty:
+                break
+            changed.pop(job.id, None)
+            changed[job.id] = job
+        return list(changed.values())
+
+    def counts(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def clear_finished(self):
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished]:
+            del self.jobs[job_id]
+
+    def shutdown(self):
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+        self.executor.shutdown(wait=False, cancel_futures=True)
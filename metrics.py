@@ -0,0 +1,167 @@
+"""Timing spans for pdf_ops.
+
+Operations report their phases (open, search, apply_redactions, save, ...) as spans with
+a duration and counters such as pages, matches and bytes. Nothing is recorded unless a
+listener is registered:
+
+    with metrics.collect() as spans:
+        pdf_ops.redact_pdf("in.pdf", "SECRET")
+    for s in spans:
+        print(s.name, s.duration, s.fields)
+
+Spans from pool worker processes are not collected; the parent's span covers them.
+"""
+import functools
+import json
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_ORIGIN = time.perf_counter()
+_listeners = []
+_local = threading.local()
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, or None where it is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+class Span:
+    """A named phase. Entering it several times accumulates its duration, so a per-page
+    phase can be timed inside a loop and emitted once with emit()."""
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+        self.parent = None
+        self.start = None
+        self.duration = 0.0
+        self.calls = 0
+        self.error = None
+        self.peak_rss_mb = None
+
+    def add(self, **counts):
+        """Add to counters, e.g. span.add(pages=1, matches=3)."""
+        for key, value in counts.items():
+            self.fields[key] = self.fields.get(key, 0) + value
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        stack = _stack()
+        if self.start is None:
+            self.start = time.perf_counter() - _ORIGIN
+            self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._entered = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration += time.perf_counter() - self._entered
+        self.calls += 1
+        _stack().pop()
+        if exc_type is not None and self.error is None:
+            self.error = exc_type.__name__
+
+    def emit(self):
+        """Hand the finished span to the listeners."""
+        if not _listeners:
+            return
+        self.peak_rss_mb = peak_rss_mb()
+        for listener in list(_listeners):
+            listener(self)
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "parent": self.parent,
+            "start": round(self.start or 0.0, 6),
+            "duration": round(self.duration, 6),
+            "calls": self.calls,
+            **self.fields,
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+class _NullSpan:
+    def add(self, **counts):
+        pass
+
+    def set(self, **fields):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class span:
+    """Context manager timing one phase and emitting it on exit.
+
+        with metrics.span("save") as s:
+            doc.save(path)
+            s.set(bytes=os.path.getsize(path))
+    """
+
+    def __init__(self, name, **fields):
+        self._span = Span(name, **fields)
+
+    def __enter__(self):
+        return self._span.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.__exit__(exc_type, exc, tb)
+        self._span.emit()
+
+def current():
+    """The innermost open span of this thread (a no-op stand-in when there is none)."""
+    stack = _stack()
+    return stack[-1] if stack else _NULL_SPAN
+
+def instrumented(func):
+    """Decorator: run func inside a span named after it."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def add_listener(listener):
+    """listener(span) is called with each finished span."""
+    _listeners.append(listener)
+
+def remove_listener(listener):
+    _listeners.remove(listener)
+
+class collect:
+    """Context manager gathering every span emitted inside it into a list."""
+
+    def __enter__(self):
+        self.spans = []
+        add_listener(self.spans.append)
+        return self.spans
+
+    def __exit__(self, exc_type, exc, tb):
+        remove_listener(self.spans.append)
+
+def write_json(path, spans, **extra):
+    """Write spans (plus extra top-level keys) as JSON to path, or to stderr when path is "-"."""
+    data = {**extra, "peak_rss_mb": peak_rss_mb(), "spans": [s.to_dict() for s in spans]}
+    if path == "-":
+        sys.stderr.write(json.dumps(data, indent=2) + "\n")
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,127 @@
+"""OCR for pages without a text layer (scans), through PyMuPDF's Tesseract integration.
+
+Only pages that show images but have no extractable text are OCRed. Results are cached
+per page content, so a page seen before is never OCRed again, and cache misses are
+spread over a process pool. add_text_layer writes OCR words back as invisible text,
+which makes the page searchable, extractable and redactable like any other.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pymupdf as fitz
+
+import metrics
+
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "doc-tor", "ocr")
+DEFAULT_LANGUAGE = "eng"
+DEFAULT_DPI = 300
+
+_FONT = fitz.Font("helv")
+
+def needs_ocr(page):
+    """Cheap test for a scanned page: it shows images but has no extractable text.
+
+    The image list only reads the page's resources, so text pages without images are
+    decided without extracting anything.
+    """
+    if not page.get_images():
+        return False
+    return not page.get_text("text").strip()
+
+def page_key(page, language=DEFAULT_LANGUAGE, dpi=DEFAULT_DPI):
+    """Hash of what OCR would see: the page's content streams, its raw image data, its
+    rotation and the OCR settings."""
+    doc = page.parent
+    h = hashlib.sha256(f"{language}|{dpi}|{page.rotation}|{tuple(page.rect)}".encode())
+    h.update(page.read_contents())
+    for image in page.get_images():
+        h.update(doc.xref_stream_raw(image[0]) or b"")
+    return h.hexdigest()
+
+def _ocr_page(page, language, dpi):
+    # Word tuples (x0, y0, x1, y1, word, block, line, word_no) in page coordinates
+    textpage = page.get_textpage_ocr(language=language, dpi=dpi, full=True)
+    return [list(w) for w in page.get_text("words", textpage=textpage)]
+
+def _ocr_shard(source, indices, language, dpi):
+    # Runs in a worker process, so it opens its own handle
+    doc = fitz.open(source)
+    words = [_ocr_page(doc[i], language, dpi) for i in indices]
+    doc.close()
+    return words
+
+def _check_tesseract():
+    try:
+        fitz.get_tessdata()
+    except RuntimeError:
+        raise RuntimeError("OCR needs Tesseract: install it (e.g. apt install tesseract-ocr) or set TESSDATA_PREFIX.")
+
+def ocr_words(doc, source=None, pages=None, language=DEFAULT_LANGUAGE, dpi=DEFAULT_DPI, workers=None, cache_dir=DEFAULT_CACHE):
+    """OCR the selected pages of an open doc that need it. Returns {page_index: words}.
+
+    pages: 0-based indices (default: all). source is the document's path; without one
+    (in-memory documents) the pages are OCRed in this process. workers defaults to the
+    CPU count. cache_dir=None disables the cache.
+    """
+    indices = range(doc.page_count) if pages is None else pages
+    with metrics.span("ocr") as span:
+        todo = [i for i in indices if needs_ocr(doc[i])]
+        keys = {i: page_key(doc[i], language, dpi) for i in todo}
+        results = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            for i in todo:
+                try:
+                    with open(os.path.join(cache_dir, keys[i] + ".json"), encoding="utf-8") as f:
+                        results[i] = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        misses = [i for i in todo if i not in results]
+        span.set(pages=len(todo), cached=len(todo) - len(misses))
+        if not misses:
+            return results
+
+        _check_tesseract()
+        workers = min(workers or os.cpu_count() or 1, len(misses))
+        if workers <= 1 or source is None:
+            words = [_ocr_page(doc[i], language, dpi) for i in misses]
+        else:
+            # Interleaved shards, so scans bunched together are shared across workers
+            shards = [misses[n::workers] for n in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_ocr_shard, source, shard, language, dpi) for shard in shards]
+                by_page = {i: w for shard, future in zip(shards, futures) for i, w in zip(shard, future.result())}
+            words = [by_page[i] for i in misses]
+
+        for i, page_words in zip(misses, words):
+            results[i] = page_words
+            if cache_dir:
+                # Written under a temp name so a concurrent reader never sees half a file
+                path = os.path.join(cache_dir, keys[i] + ".json")
+                with open(f"{path}.{os.getpid()}.tmp", "w", encoding="utf-8") as f:
+                    json.dump(page_words, f)
+                os.replace(f"{path}.{os.getpid()}.tmp", path)
+    return results
+
+def add_text_layer(page, words):
+    """Write OCR words onto the page as invisible text, each word stretched to its box so
+    searches (and redactions) cover the word on the scan."""
+    shape = page.new_shape()
+    for x0, y0, x1, y1, word, *_ in words:
+        fontsize = (y1 - y0) / (_FONT.ascender - _FONT.descender)
+        length = _FONT.text_length(word, fontsize)
+        if fontsize <= 0 or length <= 0:
+            continue
+        point = fitz.Point(x0, y1 + _FONT.descender * fontsize)
+        shape.insert_text(point, word, fontsize=fontsize, fontname="helv", render_mode=3,
+                          morph=(point, fitz.Matrix((x1 - x0) / length, 1)))
+    shape.commit()
+
+def ocr_document(doc, source=None, pages=None, language=DEFAULT_LANGUAGE, dpi=DEFAULT_DPI, workers=None, cache_dir=DEFAULT_CACHE):
+    """OCR the pages of doc that need it and add their text layers. Returns the OCRed page indices."""
+    results = ocr_words(doc, source, pages, language, dpi, workers, cache_dir)
+    for i, words in results.items():
+        add_text_layer(doc[i], words)
+    return sorted(results)
@@ -0,0 +1,206 @@
+import atexit
+import os
+import pathlib
+import queue
+import shutil
+import signal
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+SOFFICE_CANDIDATES = (
+    "/usr/bin/soffice",
+    "/usr/lib/libreoffice/program/soffice",
+    "/opt/libreoffice/program/soffice",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+)
+
+def find_soffice():
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    for path in SOFFICE_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+def _output_path(outdir, src):
+    # Where soffice --convert-to pdf --outdir writes the PDF of src
+    return os.path.join(outdir, os.path.splitext(os.path.basename(src))[0] + ".pdf")
+
+def _kill(proc):
+    # soffice is a launcher that starts soffice.bin; killing the session it leads takes both
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+class _Worker:
+    """One long-lived headless LibreOffice instance with its own user profile.
+
+    The instance stays up between jobs. A conversion runs a short-lived soffice client on
+    the same profile, which hands its --convert-to request to the running instance over
+    LibreOffice's IPC pipe and exits when it is done, so only the first job pays for
+    start-up. A private profile lets several instances run side by side.
+    """
+
+    def __init__(self, soffice, profile_dir, max_jobs):
+        self.soffice = soffice
+        self.profile_dir = profile_dir
+        self.max_jobs = max_jobs
+        self.jobs = 0
+        self.server = None
+
+    def _command(self, *args):
+        return [
+            self.soffice,
+            f"-env:UserInstallation={pathlib.Path(self.profile_dir).as_uri()}",
+            "--headless", "--norestore", "--nologo", "--nodefault", "--nolockcheck", *args,
+        ]
+
+    def _spawn(self, cmd):
+        return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+    def start(self):
+        if self.server is None or self.server.poll() is not None:
+            self.server = self._spawn(self._command("--invisible"))
+
+    def stop(self):
+        if self.server is not None:
+            _kill(self.server)
+            self.server = None
+
+    def recycle(self):
+        self.stop()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+        self.jobs = 0
+
+    def _run_client(self, files, outdir, timeout):
+        client = self._spawn(self._command("--convert-to", "pdf", "--outdir", outdir, *files))
+        try:
+            client.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # The conversion may hang in the instance, not the client: kill both process
+            # groups and start the next job from a clean profile
+            _kill(client)
+            self.recycle()
+            raise TimeoutError(f"LibreOffice timed out after {timeout}s.")
+
+    def convert(self, files, outdir, timeout):
+        self.start()
+        self._run_client(files, outdir, timeout)
+        missing = [f for f in files if not os.path.exists(_output_path(outdir, f))]
+        if missing:
+            # Some LibreOffice versions drop conversions handed to a running instance, so
+            # retry those without one: the client then converts them itself
+            self.stop()
+            self._run_client(missing, outdir, timeout)
+        self.jobs += len(files)
+        if self.jobs >= self.max_jobs:
+            self.recycle()
+
+class LibreOfficePool:
+    """Convert Word documents to PDF with a pool of headless LibreOffice workers.
+
+    Each worker keeps a headless soffice running between conversions, and documents are
+    handed to it in batches of batch_size. timeout is per document (convert() can override
+    it per call); a worker that times out is killed with its soffice.bin and its profile
+    recycled, and the documents of a failed batch are retried one by one so a single bad
+    file cannot fail its neighbours.
+    """
+
+    def __init__(self, size=None, timeout=120, batch_size=10, max_jobs=200, soffice=None):
+        self.soffice = soffice or find_soffice()
+        if not self.soffice:
+            raise RuntimeError("LibreOffice (soffice) was not found. Install it or use the docx2pdf backend.")
+        self.size = size or os.cpu_count() or 1
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.base_dir = tempfile.mkdtemp(prefix="doctor_soffice_")
+        # Last in, first out, so light use keeps going to the instances already running;
+        # the others are only started when jobs overlap
+        self.workers = queue.LifoQueue()
+        self._all = [_Worker(self.soffice, os.path.join(self.base_dir, f"profile{n}"), max_jobs) for n in range(self.size)]
+        for worker in reversed(self._all):
+            self.workers.put(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for worker in self._all:
+            worker.stop()
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def _run(self, files, outdir, timeout):
+        worker = self.workers.get()
+        try:
+            worker.convert(files, outdir, timeout * len(files))
+        finally:
+            self.workers.put(worker)
+
+    def _convert_batch(self, batch, timeout):
+        """batch: list of (source, destination). Returns (source, destination or None, error) tuples."""
+        outdir = tempfile.mkdtemp(dir=self.base_dir, prefix="out_")
+        try:
+            error = None
+            try:
+                self._run([src for src, _ in batch], outdir, timeout)
+            except TimeoutError as e:
+                error = str(e)
+            results = []
+            for src, dest in batch:
+                produced = _output_path(outdir, src)
+                if not os.path.exists(produced) and len(batch) > 1:
+                    # Retry on its own, e.g. when another document in the batch hung
+                    results.extend(self._convert_batch([(src, dest)], timeout))
+                    continue
+                if os.path.exists(produced):
+                    shutil.move(produced, dest)
+                    results.append((src, dest, None))
+                else:
+                    results.append((src, None, error or "LibreOffice did not produce a PDF."))
+            return results
+        finally:
+            shutil.rmtree(outdir, ignore_errors=True)
+
+    def convert(self, jobs, timeout=None):
+        """jobs: list of (source, destination) paths. Returns (source, destination or None, error) tuples.
+
+        timeout: seconds per document for this call (default: the pool's).
+        """
+        timeout = timeout or self.timeout
+        batches = []
+        # Same-named sources would collide in a batch's output directory, so keep them apart
+        for src, dest in jobs:
+            stem = os.path.splitext(os.path.basename(src))[0]
+            for batch, stems in batches:
+                if len(batch) < self.batch_size and stem not in stems:
+                    batch.append((src, dest))
+                    stems.add(stem)
+                    break
+            else:
+                batches.append(([(src, dest)], {stem}))
+        with ThreadPoolExecutor(max_workers=self.size) as pool:
+            return [result for results in pool.map(lambda batch: self._convert_batch(batch, timeout), [batch for batch, _ in batches])
+                    for result in results]
+
+# Shared pool, so repeated conversions in one process reuse the running instances.
+# Per-call settings such as the timeout go to convert(), not here.
+_default_pool = None
+
+def get_pool(**kwargs):
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = LibreOfficePool(**kwargs)
+        atexit.register(_default_pool.close)
+    return _default_pool
@@ -1,9 +1,27 @@
-import fitz
+import pymupdf as fitz
+import glob
+import hashlib
+import io
+import json
+import mmap
 import os
+import re
+import shutil
+import stat
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from datetime import datetime
 
-from pdf2docx import Converter
-from docx2pdf import convert as docx_to_pdf_conv
+import metrics
+
+# PyMuPDF prints its messages (and pdf2docx's "import fitz" its deprecation warning) to
+# stdout by default, which would corrupt PDFs and text piped through stdout
+fitz.set_messages(fd=2)
+
+# pdf2docx (opencv, numpy, python-docx), docx2pdf and the LibreOffice pool are imported
+# inside the conversion functions, so commands that never convert don't pay for them
 
 def format_date(date_str):
     if not date_str:
@@ -14,12 +32,156 @@ def format_date(date_str):
     except:
         return date_str
 
-def get_pdf_info(file_path):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+_PAGE_TOKEN = re.compile(r"^(-?\d+)?(-)?(-?\d+)?(?::(\d+))?$")
+
+def _page_index(number, page_count, token):
+    # 1-based page number, or negative counting back from the last page (-1 = last)
+    index = number - 1 if number > 0 else page_count + number
+    if number == 0 or not 0 <= index < page_count:
+        raise ValueError(f"Page '{token}' is out of range (document has {page_count} pages).")
+    return index
+
+def parse_page_spec(spec, page_count):
+    """Parse a page selection into a list of 0-based indices, in the order given.
+
+    Comma-separated items, 1-based and inclusive:
+      "5"       a single page          "-1"      the last page (negatives count from the end)
+      "3-7"     a range                "10-"     page 10 to the end
+      "1-20:2"  a range with a step    "-3--1"   the last three pages
+      "odd", "even", "all"
+    """
+    indices = []
+    for token in str(spec).replace(" ", "").lower().split(","):
+        if not token:
+            continue
+        if token in ("all", "odd", "even"):
+            start = 1 if token == "even" else 0
+            indices.extend(range(start, page_count, 1 if token == "all" else 2))
+            continue
+        m = _PAGE_TOKEN.match(token)
+        first, dash, last, step = m.groups() if m else (None,) * 4
+        # A page number is required on at least one side, and a step only goes with a range
+        if not (first or last) or (step is not None and (not dash or int(step) < 1)):
+            raise ValueError(f"Invalid page selection '{token}'.")
+        start = _page_index(int(first), page_count, token) if first else 0
+        if not dash:
+            indices.append(start)
+            continue
+        end = _page_index(int(last), page_count, token) if last else page_count - 1
+        if end < start:
+            raise ValueError(f"Invalid page range '{token}': end is before start.")
+        indices.extend(range(start, end + 1, int(step or 1)))
+    return list(dict.fromkeys(indices))
+
+def format_page_spec(indices):
+    """The inverse of parse_page_spec for sorted output: [0, 1, 2, 4] -> "1-3,5"."""
+    parts = []
+    run_start = prev = None
+    for i in sorted(set(indices)):
+        if prev is not None and i == prev + 1:
+            prev = i
+            continue
+        if run_start is not None:
+            parts.append(f"{run_start + 1}" if run_start == prev else f"{run_start + 1}-{prev + 1}")
+        run_start = prev = i
+    if run_start is not None:
+        parts.append(f"{run_start + 1}" if run_start == prev else f"{run_start + 1}-{prev + 1}")
+    return ",".join(parts)
+
+def _select_pages(pages, page_count):
+    """pages: None (every page), a page spec string, or an iterable of 0-based indices."""
+    if pages is None:
+        return range(page_count)
+    if isinstance(pages, str):
+        return parse_page_spec(pages, page_count)
+    return [p for p in pages if 0 <= p < page_count]
+
+def file_hash(file_path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's content (or of in-memory PDF data)."""
+    if not _is_path(file_path):
+        return hashlib.sha256(file_path).hexdigest()
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# Operations take a file path, or the PDF itself as bytes, a memoryview or a binary file
+# object. Paths are opened directly: MuPDF reads them lazily, which keeps memory lowest.
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+def _stream_data(stream):
+    """The content of a binary file object as a bytes-like object, copying as little as possible."""
+    if isinstance(stream, io.BytesIO):
+        return stream.getbuffer()
+    try:
+        fd = stream.fileno()
+        st = os.fstat(fd)
+        if stat.S_ISREG(st.st_mode) and st.st_size and stream.tell() == 0:
+            # A regular file (e.g. stdin redirected from disk): map it instead of reading a copy
+            return memoryview(mmap.mmap(fd, 0, access=mmap.ACCESS_READ))
+    except (AttributeError, OSError, ValueError):
+        pass
+    return stream.read()
+
+def _source(file_path):
+    """Check a path exists, or turn a file object into bytes-like data that can be opened repeatedly."""
+    if _is_path(file_path):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File '{file_path}' not found.")
+        return file_path
+    if isinstance(file_path, (bytes, bytearray, memoryview)):
+        return file_path
+    return _stream_data(file_path)
+
+def _source_name(file_path):
+    """(base, ext) of the source's file name, for naming output files."""
+    if _is_path(file_path):
+        return os.path.splitext(os.path.basename(file_path))
+    return "document", ".pdf"
+
+def _result_cache(cache):
+    """cache: a result_cache.ResultCache, True for the default one, or None."""
+    if not cache:
+        return None
+    import result_cache
+    return result_cache.ResultCache() if cache is True else cache
+
+def _open(file_path):
+    if not _is_path(file_path):
+        with metrics.span("open", bytes=len(file_path), stream=True) as span:
+            doc = fitz.open(stream=file_path, filetype="pdf")
+            span.set(pages=doc.page_count)
+        return doc
+    with metrics.span("open", bytes=os.path.getsize(file_path)) as span:
+        doc = fitz.open(file_path)
+        span.set(pages=doc.page_count)
+    return doc
+
+@metrics.instrumented
+def get_pdf_info(file_path, cache=None):
+    """cache: a result_cache.ResultCache (or True for the default one) to reuse results
+    for identical content."""
+    file_path = _source(file_path)
+    store = _result_cache(cache)
+    if store:
+        key = store.key(file_path, "info")
+        info = store.get_value(key)
+        if info is not None:
+            metrics.current().set(cached=True)
+            return info
     
-    doc = fitz.open(file_path)
-    info = {
+    doc = _open(file_path)
+    info = _doc_info(doc)
+    doc.close()
+    if store:
+        store.put_value(key, "info", info)
+    return info
+
+def _doc_info(doc):
+    return {
         "pages": doc.page_count,
         "encrypted": doc.is_encrypted,
         "format": doc.metadata.get("format", "PDF"),
@@ -28,194 +190,1478 @@ def get_pdf_info(file_path):
         "creation_date": format_date(doc.metadata.get("creationDate", "")),
         "mod_date": format_date(doc.metadata.get("modDate", ""))
     }
-    doc.close()
-    return info
 
-def convert_pdf_to_word(file_path, output_path=None):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+def _convert_chunk(file_path, start, end, chunk_path):
+    # Runs in a worker process. Written under a temp name so only finished chunks count as done
+    from pdf2docx import Converter
+    tmp_path = chunk_path + ".tmp"
+    cv = Converter(file_path)
+    cv.convert(tmp_path, start=start, end=end)
+    cv.close()
+    os.replace(tmp_path, chunk_path)
+    return chunk_path
+
+def _stitch_docx(chunk_paths, output_path):
+    """Append the bodies of chunk_paths[1:] to chunk_paths[0] and save as output_path."""
+    from docx import Document
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    
+    master = Document(chunk_paths[0])
+    body = master.element.body
+    for chunk_path in chunk_paths[1:]:
+        chunk = Document(chunk_path)
+        # Images and hyperlinks are relationships of the chunk's part; re-create them on the master
+        for blip in chunk.element.body.iter(qn("a:blip")):
+            rid = blip.get(qn("r:embed"))
+            if rid:
+                image_part = chunk.part.related_parts[rid]
+                new_rid, _ = master.part.get_or_add_image(io.BytesIO(image_part.blob))
+                blip.set(qn("r:embed"), new_rid)
+        for link in chunk.element.body.iter(qn("w:hyperlink")):
+            rid = link.get(qn("r:id"))
+            if rid:
+                rel = chunk.part.rels[rid]
+                link.set(qn("r:id"), master.part.relate_to(rel.target_ref, RT.HYPERLINK, is_external=True))
+        
+        # The master's closing section properties now end a section mid-document,
+        # so move them into a paragraph and let the chunk's own ones close the body
+        sect_pr = body.find(qn("w:sectPr"))
+        paragraph = OxmlElement("w:p")
+        p_pr = OxmlElement("w:pPr")
+        p_pr.append(sect_pr)
+        paragraph.append(p_pr)
+        body.append(paragraph)
+        for element in list(chunk.element.body):
+            body.append(element)
+    master.save(output_path)
+
+def _remove_chunks(work_dir):
+    """Delete the checkpoint files of convert_pdf_to_word, and nothing else, from work_dir."""
+    for path in glob.glob(os.path.join(work_dir, "chunk_*.docx*")) + [os.path.join(work_dir, "manifest.json")]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+@metrics.instrumented
+def convert_pdf_to_word(file_path, output_path=None, workers=1, chunk_size=None, work_dir=None, on_progress=None, cache=None):
+    """Convert a PDF to .docx.
+
+    With workers > 1 or a chunk_size, the pages are converted in chunks by a process pool
+    and the chunk files are stitched into one document. Finished chunks are kept in
+    work_dir (default: "<output>.parts"), so re-running an interrupted conversion only
+    converts the missing chunks. Only checkpoint files are ever deleted from work_dir; a
+    non-empty directory without a checkpoint manifest is refused. on_progress(done, total) is called per finished chunk;
+    an exception raised from it stops the conversion (finished chunks are kept).
+    cache: see get_pdf_info (used when writing to a file).
+    """
+    file_path = _source(file_path)
+    
+    if not _is_path(file_path):
+        # Chunk workers reopen the file by path, so in-memory input is converted in one go.
+        # Without an output_path the .docx is returned as bytes.
+        from pdf2docx import Converter
+        target = io.BytesIO() if output_path is None else output_path
+        cv = Converter(stream=bytes(file_path))
+        cv.convert(target, start=0, end=None)
+        cv.close()
+        return target.getvalue() if output_path is None else output_path
         
     if output_path is None:
         output_path = os.path.splitext(file_path)[0] + ".docx"
-        
-    cv = Converter(file_path)
-    cv.convert(output_path, start=0, end=None)
-    cv.close()
     
+    store = _result_cache(cache) if _is_path(output_path) else None
+    if store:
+        # Chunking changes how pages are laid out in the stitched document
+        key = store.key(file_path, "pdf-to-word", {"chunk_size": chunk_size} if chunk_size else {"workers": max(1, workers)})
+        if store.get_file(key, output_path):
+            metrics.current().set(cached=True)
+            return output_path
+    
+    if workers <= 1 and not chunk_size:
+        from pdf2docx import Converter
+        cv = Converter(file_path)
+        cv.convert(output_path, start=0, end=None)
+        cv.close()
+        if store:
+            store.put_file(key, "pdf-to-word", output_path)
+        return output_path
+    
+    doc = _open(file_path)
+    page_count = doc.page_count
+    doc.close()
+    chunk_size = chunk_size or max(1, min(50, -(-page_count // workers)))
+    chunks = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+    
+    # Checkpoints are only valid for the same source file and chunking
+    work_dir = work_dir or output_path + ".parts"
+    st = os.stat(file_path)
+    manifest = {"source": os.path.abspath(file_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns, "chunk_size": chunk_size}
+    manifest_path = os.path.join(work_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                stale = json.load(f) != manifest
+        except (OSError, ValueError):
+            stale = True
+        if stale:
+            _remove_chunks(work_dir)
+    elif os.path.isdir(work_dir) and os.listdir(work_dir):
+        # Never touch a directory this function did not create
+        raise ValueError(f"Work directory '{work_dir}' is not empty and holds no conversion checkpoint.")
+    os.makedirs(work_dir, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    
+    chunk_paths = [os.path.join(work_dir, f"chunk_{start:06d}-{end:06d}.docx") for start, end in chunks]
+    todo = [(start, end, path) for (start, end), path in zip(chunks, chunk_paths) if not os.path.exists(path)]
+    done = len(chunks) - len(todo)
+    if on_progress:
+        on_progress(done, len(chunks))
+    if todo:
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+            futures = [pool.submit(_convert_chunk, file_path, start, end, path) for start, end, path in todo]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    done += 1
+                    if on_progress:
+                        on_progress(done, len(chunks))
+            except BaseException:
+                # e.g. on_progress raised to cancel: don't start the remaining chunks
+                for future in futures:
+                    future.cancel()
+                raise
+    
+    if len(chunk_paths) == 1:
+        shutil.copyfile(chunk_paths[0], output_path)
+    else:
+        _stitch_docx(chunk_paths, output_path)
+    _remove_chunks(work_dir)
+    try:
+        os.rmdir(work_dir)
+    except OSError:
+        pass
+    if store:
+        store.put_file(key, "pdf-to-word", output_path)
     return output_path
 
-def convert_word_to_pdf(file_path, output_path=None):
+WORD_BACKENDS = ("auto", "docx2pdf", "libreoffice")
+
+def _word_backend(backend):
+    if backend not in WORD_BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Use one of: {', '.join(WORD_BACKENDS)}.")
+    if backend == "auto":
+        # docx2pdf drives MS Word, which only exists on Windows and macOS
+        return "docx2pdf" if sys.platform in ("win32", "darwin") else "libreoffice"
+    return backend
+
+@metrics.instrumented
+def convert_word_to_pdf(file_path, output_path=None, backend="auto", timeout=120):
+    """backend: "docx2pdf" (MS Word), "libreoffice" (headless soffice pool) or "auto"."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File '{file_path}' not found.")
     
-    # docx2pdf.convert(input, output)
-    docx_to_pdf_conv(file_path, output_path)
-    
     if output_path is None:
         output_path = os.path.splitext(file_path)[0] + ".pdf"
     
+    if _word_backend(backend) == "libreoffice":
+        import office
+        # The shared pool keeps its workers warm across calls in this process
+        [(_, _, error)] = office.get_pool().convert([(file_path, output_path)], timeout=timeout)
+        if error:
+            raise RuntimeError(error)
+        return output_path
+    
+    from docx2pdf import convert as docx_to_pdf_conv
+    # docx2pdf.convert(input, output)
+    docx_to_pdf_conv(file_path, output_path)
     return output_path
 
-def rotate_pages(file_path, rotation, output_path=None):
-    """Rotation must be 0, 90, 180, 270."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+WORD_EXTENSIONS = (".docx", ".doc", ".odt", ".rtf")
+
+@metrics.instrumented
+def convert_words_to_pdf(files, output_dir=None, backend="auto", workers=None, timeout=120):
+    """Convert many Word documents (a list, or a directory to scan) to PDF.
+
+    output_dir mirrors the source folders below their common folder. Documents that would
+    write the same PDF (r.doc and r.docx side by side) raise ValueError before any runs.
+    Returns (source, pdf_path or None, error) per document.
+    """
+    if isinstance(files, str):
+        files = sorted(os.path.join(dirpath, name) for dirpath, _, names in os.walk(files)
+                       for name in names if name.lower().endswith(WORD_EXTENSIONS))
+    out_dirs = _output_dirs(files, output_dir)
+    for folder in set(out_dirs.values()):
+        os.makedirs(folder, exist_ok=True)
+    jobs = [(f, os.path.join(out_dirs[f], os.path.splitext(os.path.basename(f))[0] + ".pdf")) for f in files]
     
-    doc = fitz.open(file_path)
-    for page in doc:
-        page.set_rotation(rotation)
+    if _word_backend(backend) == "libreoffice":
+        import office
+        with office.LibreOfficePool(size=workers, timeout=timeout) as pool:
+            return pool.convert(jobs)
     
-    if output_path is None:
+    from docx2pdf import convert as docx_to_pdf_conv
+    # MS Word automation cannot run conversions in parallel
+    results = []
+    for src, dest in jobs:
+        try:
+            docx_to_pdf_conv(src, dest)
+            results.append((src, dest, None))
+        except Exception as e:
+            results.append((src, None, str(e)))
+    return results
+
+# doc.save options for compact output: store identical objects once, drop unreachable ones, compress streams
+OPTIMIZE_SAVE_OPTIONS = {"garbage": 4, "clean": True, "deflate": True, "deflate_images": True, "deflate_fonts": True}
+
+def _save(doc, file_path, output_path, in_place=False, incremental=False, full=False, optimize=False, **options):
+    """Save doc and close it. Returns the path written; output_path may also be a binary
+    stream to write to, or None for in-memory input, in which case the bytes are returned.
+
+    optimize adds OPTIMIZE_SAVE_OPTIONS, which rules out an incremental save.
+
+    in_place overwrites file_path. With incremental, only changed objects are appended to
+    the existing file; a full rewrite is used instead when the caller asks for one (full=True,
+    e.g. after deleting pages or redacting), when save options such as encryption are given,
+    or when MuPDF cannot save the document incrementally.
+    """
+    if optimize:
+        options = {**OPTIMIZE_SAVE_OPTIONS, **options}
+    if in_place and not _is_path(file_path):
+        doc.close()
+        raise ValueError("in_place needs a file path, not in-memory input.")
+    with metrics.span("save", pages=doc.page_count) as span:
+        if not in_place and not _is_path(output_path):
+            data = doc.tobytes(**options)
+            doc.close()
+            span.set(bytes=len(data))
+            if output_path is None:
+                return data
+            output_path.write(data)
+            return output_path
+        
+        if not in_place:
+            doc.save(output_path, **options)
+            doc.close()
+            span.set(bytes=os.path.getsize(output_path))
+            return output_path
+        
+        if incremental and not full and not options and doc.can_save_incrementally():
+            before = os.path.getsize(file_path)
+            doc.save(file_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            doc.close()
+            span.set(bytes=os.path.getsize(file_path) - before, incremental=True)
+            return file_path
+        
+        # The source is still open, so write a sibling file and swap it in afterwards
+        tmp_path = file_path + ".tmp"
+        doc.save(tmp_path, **options)
+        doc.close()
+        os.replace(tmp_path, file_path)
+        span.set(bytes=os.path.getsize(file_path))
+        return file_path
+
+def _rotate(doc, rotation, pages=None, on_progress=None):
+    # Only the selected pages are loaded
+    selected = _select_pages(pages, doc.page_count)
+    for n, i in enumerate(selected):
+        if on_progress:
+            on_progress(n, len(selected))
+        doc[i].set_rotation(rotation)
+    if on_progress:
+        on_progress(len(selected), len(selected))
+
+@metrics.instrumented
+def rotate_pages(file_path, rotation, output_path=None, in_place=False, incremental=False, pages=None, optimize=False, on_progress=None):
+    """Rotation must be 0, 90, 180, 270. pages: page spec or 0-based indices (default: all).
+
+    on_progress(done, total) is called per page; raising from it abandons the rotation.
+    """
+    file_path = _source(file_path)
+    
+    doc = _open(file_path)
+    try:
+        _rotate(doc, rotation, pages, on_progress)
+    except BaseException:
+        doc.close()
+        raise
+    
+    if output_path is None and _is_path(file_path):
         base, ext = os.path.splitext(file_path)
         output_path = f"{base}_rotated{ext}"
     
-    doc.save(output_path)
-    doc.close()
-    return output_path
+    return _save(doc, file_path, output_path, in_place, incremental, optimize=optimize)
 
-def delete_pages(file_path, pages_to_delete, output_path=None):
-    """pages_to_delete: list of integers (0-based index)"""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
-    
-    doc = fitz.open(file_path)
+def _delete(doc, pages_to_delete, on_progress=None):
+    if pages_to_delete is None:
+        raise ValueError("No pages selected for deletion.")
     # Delete pages in reverse order to avoid index shifting
-    for p in sorted(pages_to_delete, reverse=True):
-        if 0 <= p < doc.page_count:
-            doc.delete_page(p)
+    selected = sorted(set(_select_pages(pages_to_delete, doc.page_count)), reverse=True)
+    for n, p in enumerate(selected):
+        if on_progress:
+            on_progress(n, len(selected))
+        doc.delete_page(p)
+    if on_progress:
+        on_progress(len(selected), len(selected))
+
+@metrics.instrumented
+def delete_pages(file_path, pages_to_delete, output_path=None, in_place=False, incremental=False, optimize=False, on_progress=None):
+    """pages_to_delete: page spec string (e.g. "1,3-5") or list of integers (0-based index)
+
+    on_progress(done, total) is called per deleted page; raising from it abandons the deletion.
+    """
+    file_path = _source(file_path)
+    
+    doc = _open(file_path)
+    try:
+        _delete(doc, pages_to_delete, on_progress)
+    except BaseException:
+        doc.close()
+        raise
             
-    if output_path is None:
+    if output_path is None and _is_path(file_path):
         base, ext = os.path.splitext(file_path)
         output_path = f"{base}_deleted{ext}"
     
-    doc.save(output_path)
-    doc.close()
-    return output_path
+    # An incremental update would leave the deleted pages' objects in the file
+    return _save(doc, file_path, output_path, in_place, incremental, full=True, optimize=optimize)
 
-def extract_page_range(file_path, start_page, end_page, output_path=None):
-    """1-based start and end page numbers."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+def _insert_pages(new_doc, doc, indices, on_progress=None):
+    # Copy contiguous runs with one insert_pdf call each; progress is reported per run
+    indices = list(indices)
+    run_start = prev = None
+    for i in indices:
+        if prev is not None and i == prev + 1:
+            prev = i
+            continue
+        if run_start is not None:
+            new_doc.insert_pdf(doc, from_page=run_start, to_page=prev)
+            if on_progress:
+                on_progress(new_doc.page_count, len(indices))
+        run_start = prev = i
+    if run_start is not None:
+        new_doc.insert_pdf(doc, from_page=run_start, to_page=prev)
+        if on_progress:
+            on_progress(new_doc.page_count, len(indices))
+
+@metrics.instrumented
+def extract_pages(file_path, pages, output_path=None, optimize=False, on_progress=None):
+    """Copy the selected pages (page spec or 0-based indices), in that order, to a new file.
+
+    on_progress(done, total) is called as pages are copied; raising from it abandons the copy.
+    """
+    file_path = _source(file_path)
     
-    doc = fitz.open(file_path)
-    # Create new doc
+    doc = _open(file_path)
+    indices = _select_pages(pages, doc.page_count)
+    if not indices:
+        doc.close()
+        raise ValueError("No pages selected.")
     new_doc = fitz.open()
+    try:
+        if on_progress:
+            on_progress(0, len(indices))
+        _insert_pages(new_doc, doc, indices, on_progress)
+    except BaseException:
+        new_doc.close()
+        doc.close()
+        raise
     
-    # Python slices are 0-based and exclusive at the end
-    # User input 1-5 means index 0 to 4
-    new_doc.insert_pdf(doc, from_page=start_page-1, to_page=end_page-1)
-    
-    if output_path is None:
+    if output_path is None and _is_path(file_path):
         base, ext = os.path.splitext(file_path)
-        output_path = f"{base}_pages_{start_page}-{end_page}{ext}"
+        label = re.sub(r"[^\w-]+", "_", pages) if isinstance(pages, str) else "selection"
+        output_path = f"{base}_pages_{label}{ext}"
         
-    new_doc.save(output_path)
-    new_doc.close()
+    output_path = _save(new_doc, file_path, output_path, optimize=optimize)
     doc.close()
     return output_path
 
-def encrypt_pdf(file_path, password, output_path=None):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+def extract_page_range(file_path, start_page, end_page, output_path=None, optimize=False):
+    """1-based start and end page numbers."""
+    return extract_pages(file_path, f"{start_page}-{end_page}", output_path, optimize)
+
+def _toc_chunks(doc, level):
+    """(title, indices) for each bookmark at `level` or above, up to the next such bookmark."""
+    starts = [(title, page - 1) for lvl, title, page in doc.get_toc() if lvl <= level and page > 0]
+    chunks = []
+    if not starts or starts[0][1] > 0:
+        chunks.append(("front", 0))
+    chunks += starts
+    result = []
+    for n, (title, start) in enumerate(chunks):
+        end = chunks[n + 1][1] if n + 1 < len(chunks) else doc.page_count
+        if end > start:
+            result.append((title, list(range(start, end))))
+    return result
+
+def _split_chunks(doc, every=None, ranges=None, toc_level=None):
+    """Work out (label, indices) for each output file of split_pdf."""
+    if toc_level is not None:
+        return _toc_chunks(doc, toc_level)
+    if ranges is not None:
+        return [(spec, parse_page_spec(spec, doc.page_count)) for spec in ranges]
+    every = every or 1
+    return [(None, list(range(start, min(start + every, doc.page_count)))) for start in range(0, doc.page_count, every)]
+
+# Source document of a pool worker process, opened once by the pool initializer
+_worker_doc = None
+
+def _open_worker_doc(file_path):
+    global _worker_doc
+    _worker_doc = fitz.open(file_path)
+
+def _write_chunk(indices, output_path, doc=None, optimize=False):
+    new_doc = fitz.open()
+    _insert_pages(new_doc, doc or _worker_doc, indices)
+    return _save(new_doc, None, output_path, optimize=optimize)
+
+@metrics.instrumented
+def split_pdf(file_path, output_dir=None, every=None, ranges=None, toc_level=None, workers=1, optimize=False):
+    """Split a PDF into several files, opening the source once.
+
+    Chunking (pick one): every=N pages (every=1, the default, bursts one file per page),
+    ranges=list of page specs (one file each), or toc_level=L (one file per bookmark at level <= L).
+    workers > 1 writes chunks from a process pool; each worker opens the source once.
+    In-memory input needs an output_dir and is split in this process.
+    Returns the list of written paths.
+    """
+    file_path = _source(file_path)
+    if not _is_path(file_path):
+        if output_dir is None:
+            raise ValueError("An output directory is required for in-memory input.")
+        workers = 1
     
-    doc = fitz.open(file_path)
-    if output_path is None:
+    doc = _open(file_path)
+    chunks = _split_chunks(doc, every, ranges, toc_level)
+    if not chunks:
+        doc.close()
+        raise ValueError("Nothing to split.")
+    
+    base, ext = _source_name(file_path)
+    if output_dir is None:
+        output_dir = os.path.join(os.path.dirname(file_path), f"{base}_split")
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    for n, (label, indices) in enumerate(chunks, 1):
+        name = f"{base}_part{n:03d}"
+        if label:
+            name += "_" + re.sub(r"[^\w-]+", "_", label).strip("_")[:40]
+        outputs.append(os.path.join(output_dir, name + ext))
+    
+    if workers <= 1 or len(chunks) == 1:
+        for (_, indices), output_path in zip(chunks, outputs):
+            _write_chunk(indices, output_path, doc, optimize)
+        doc.close()
+        return outputs
+    
+    doc.close()
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_open_worker_doc, initargs=(file_path,)) as pool:
+        # Chunks sent per task keep the submission overhead low for one-page bursts
+        list(pool.map(_write_chunk, [indices for _, indices in chunks], outputs, [None] * len(chunks), [optimize] * len(chunks), chunksize=max(1, len(chunks) // (workers * 4))))
+    return outputs
+
+def _save_progress(doc, on_progress):
+    # Encryption happens inside the single save call, so the only place to report progress
+    # (and to cancel) is before it
+    if on_progress:
+        try:
+            on_progress(0, 1)
+        except BaseException:
+            doc.close()
+            raise
+
+@metrics.instrumented
+def encrypt_pdf(file_path, password, output_path=None, optimize=False, on_progress=None):
+    """on_progress(done, total) is called before and after the save, the only step; raising
+    from it before the save abandons the encryption."""
+    file_path = _source(file_path)
+    
+    doc = _open(file_path)
+    _save_progress(doc, on_progress)
+    if output_path is None and _is_path(file_path):
         base, ext = os.path.splitext(file_path)
         output_path = f"{base}_encrypted{ext}"
     
     # Save with encryption (AES 256)
-    doc.save(output_path, encryption=fitz.PDF_ENCRYPT_AES_256, owner_pw=password, user_pw=password)
-    doc.close()
+    output_path = _save(doc, file_path, output_path, optimize=optimize, encryption=fitz.PDF_ENCRYPT_AES_256, owner_pw=password, user_pw=password)
+    if on_progress:
+        on_progress(1, 1)
     return output_path
 
-def decrypt_pdf(file_path, password, output_path=None):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+@metrics.instrumented
+def decrypt_pdf(file_path, password, output_path=None, optimize=False, on_progress=None):
+    """on_progress: as for encrypt_pdf."""
+    file_path = _source(file_path)
     
-    doc = fitz.open(file_path)
+    doc = _open(file_path)
     if doc.is_encrypted:
         if not doc.authenticate(password):
+            doc.close()
             raise ValueError("Incorrect password.")
+    _save_progress(doc, on_progress)
             
-    if output_path is None:
+    if output_path is None and _is_path(file_path):
         base, ext = os.path.splitext(file_path)
         output_path = f"{base}_decrypted{ext}"
         
-    doc.save(output_path) # Saving creates an unencrypted copy
-    doc.close()
+    output_path = _save(doc, file_path, output_path, optimize=optimize) # Saving creates an unencrypted copy
+    if on_progress:
+        on_progress(1, 1)
     return output_path
 
-def extract_text_from_pdf(file_path, output_path=None):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+@metrics.instrumented
+def optimize_pdf(file_path, output_path=None, image_dpi=None, image_quality=None, in_place=False):
+    """Rewrite a PDF compactly: dedupe identical streams and fonts, garbage-collect
+    unreachable objects and compress streams. image_dpi downsamples images above
+    1.5x that resolution; image_quality (1-100) recompresses images as JPEG.
+
+    Returns (bytes_before, bytes_after, output_path); bytes_after is None when the
+    result was written to a stream.
+    """
+    file_path = _source(file_path)
     
+    before = os.path.getsize(file_path) if _is_path(file_path) else len(file_path)
+    doc = _open(file_path)
+    if image_dpi or image_quality:
+        threshold = int(image_dpi * 1.5) if image_dpi else None
+        doc.rewrite_images(dpi_threshold=threshold, dpi_target=image_dpi or 0, quality=image_quality or 0)
+    
+    if output_path is None and _is_path(file_path):
+        base, ext = os.path.splitext(file_path)
+        output_path = f"{base}_optimized{ext}"
+    
+    output_path = _save(doc, file_path, output_path, in_place, optimize=True)
+    if _is_path(output_path):
+        after = os.path.getsize(output_path)
+    else:
+        # The optimized bytes, or None when they were written to a stream
+        after = len(output_path) if isinstance(output_path, bytes) else None
+    return before, after, output_path
+
+PAGE_TEXT_MODES = ("text", "blocks", "words")
+
+# Pages per text shard at most, so the window of shards in flight holds a fixed number
+# of pages however long the document is
+MAX_SHARD_PAGES = 64
+
+def _page_shards(pages, workers):
+    """Split a list of page indices into contiguous shards for a pool of workers."""
+    # A few shards per worker keeps the pool busy when pages vary in cost
+    shard_size = max(1, min(MAX_SHARD_PAGES, -(-len(pages) // (workers * 4))))
+    return [pages[i:i + shard_size] for i in range(0, len(pages), shard_size)]
+
+def _page_text(page, mode):
+    if mode == "text":
+        return page.get_text()
+    return page.get_text(mode)
+
+def _page_text_shard(file_path, pages, mode):
+    # Runs in a worker process, so it opens its own handle
     doc = fitz.open(file_path)
-    text = ""
-    for page in doc:
-        text += page.get_text() + "\n\n"
+    results = [_page_text(doc[i], mode) for i in pages]
+    doc.close()
+    return results
+
+def iter_page_text(file_path, pages=None, mode="text", workers=1, ocr=None):
+    """Lazily yield (page_index, result) per page.
+
+    pages: page spec string or iterable of 0-based indices (default: all pages).
+    mode: "text" yields a string, "blocks" and "words" yield PyMuPDF tuples.
+    In-memory input is read in this process (workers reopen the source by path).
+    ocr (True or a Tesseract language such as "eng+deu") OCRs pages without a text layer
+    first; workers then run the OCR and the text is read in this process.
+    """
+    file_path = _source(file_path)
+    if not _is_path(file_path):
+        workers = 1
+    if mode not in PAGE_TEXT_MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Use one of: {', '.join(PAGE_TEXT_MODES)}.")
     
-    if output_path is None:
-        output_path = os.path.splitext(file_path)[0] + ".txt"
-        
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(text)
+    doc = _open(file_path)
+    pages = list(_select_pages(pages, doc.page_count))
+    if ocr:
+        _ocr_layer(doc, file_path, pages, ocr, workers)
+        workers = 1
+    
+    if workers <= 1 or len(pages) <= 1:
+        try:
+            for i in pages:
+                yield i, _page_text(doc[i], mode)
+        finally:
+            doc.close()
+        return
     
     doc.close()
+    shards = _page_shards(pages, workers)
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        # Keep a bounded window of shards in flight so memory does not grow with page count
+        pending = []
+        shard_iter = iter(shards)
+        for shard in shard_iter:
+            pending.append((shard, pool.submit(_page_text_shard, file_path, shard, mode)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            shard, future = pending.pop(0)
+            results = future.result()
+            next_shard = next(shard_iter, None)
+            if next_shard is not None:
+                pending.append((next_shard, pool.submit(_page_text_shard, file_path, next_shard, mode)))
+            for i, result in zip(shard, results):
+                yield i, result
+
+@metrics.instrumented
+def extract_text_from_pdf(file_path, output_path=None, workers=1, mode="text", pages=None, on_progress=None, ocr=None, cache=None):
+    """workers > 1 shards the pages across a process pool; output stays in page order.
+
+    Pages are written as they arrive. Non-text modes write one JSON line per page.
+    on_progress(done, total) is called per written page; raising from it stops the extraction.
+    output_path may be a text or binary stream (binary streams get UTF-8); for in-memory
+    input without an output_path the text is returned instead.
+    ocr: see iter_page_text. cache: see get_pdf_info (used when writing to a file).
+    """
+    file_path = _source(file_path)
+    
+    if output_path is None and _is_path(file_path):
+        ext = ".txt" if mode == "text" else ".jsonl"
+        output_path = os.path.splitext(file_path)[0] + ext
+    
+    store = _result_cache(cache) if _is_path(output_path) else None
+    if store:
+        key = store.key(file_path, "extract", {"mode": mode, "pages": pages, "ocr": ocr})
+        if store.get_file(key, output_path):
+            metrics.current().set(cached=True)
+            return output_path
+    
+    total = None
+    if on_progress:
+        doc = _open(file_path)
+        total = len(_select_pages(pages, doc.page_count))
+        doc.close()
+    results = iter_page_text(file_path, pages=pages, mode=mode, workers=workers, ocr=ocr)
+    if output_path is None:
+        f = io.StringIO()
+    elif _is_path(output_path):
+        f = open(output_path, "w", encoding="utf-8")
+    else:
+        f = output_path
+    write = f.write if isinstance(f, io.TextIOBase) else lambda text: f.write(text.encode("utf-8"))
+    try:
+        for done, (_, result) in enumerate(results, 1):
+            write(format_page_text(result, mode))
+            metrics.current().add(pages=1)
+            if on_progress:
+                on_progress(done, total)
+    finally:
+        if _is_path(output_path):
+            f.close()
+    
+    if output_path is None:
+        return f.getvalue()
+    if _is_path(output_path):
+        metrics.current().set(bytes=os.path.getsize(output_path))
+    if store:
+        store.put_file(key, "extract", output_path)
     return output_path
 
-def merge_pdfs(file_list, output_path="merged.pdf"):
-    merged_doc = fitz.open()
-    for file in file_list:
-        if os.path.exists(file):
-            doc = fitz.open(file)
+def format_page_text(result, mode):
+    """Serialize one iter_page_text result the way extract_text_from_pdf writes it."""
+    if mode == "text":
+        return result + "\n\n"
+    return json.dumps(result) + "\n"
+
+def read_manifest(manifest):
+    """Read one path per line from a manifest file, or from stdin when manifest is "-"."""
+    f = sys.stdin if manifest == "-" else open(manifest, encoding="utf-8")
+    try:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def _insert_inputs(merged_doc, file_list, start=0, on_progress=None):
+    """Append file_list to merged_doc. Returns the (file, reason) pairs that were skipped;
+    in-memory inputs are reported as "<input N>", counting from start."""
+    skipped = []
+    for n, file in enumerate(file_list):
+        if on_progress:
+            on_progress(n, len(file_list))
+        label = file if _is_path(file) else f"<input {start + n + 1}>"
+        if _is_path(file) and not os.path.exists(file):
+            skipped.append((label, "not found"))
+            continue
+        try:
+            doc = fitz.open(file) if _is_path(file) else fitz.open(stream=_source(file), filetype="pdf")
+        except Exception as e:
+            skipped.append((label, str(e)))
+            continue
+        with metrics.span("insert_pdf", pages=doc.page_count):
             merged_doc.insert_pdf(doc)
-            doc.close()
-    
-    merged_doc.save(output_path)
+        doc.close()
+    return skipped
+
+def _save_merged(doc, output_path, save_options):
+    with metrics.span("save", pages=doc.page_count) as span:
+        if _is_path(output_path):
+            doc.save(output_path, **save_options)
+            span.set(bytes=os.path.getsize(output_path))
+        else:
+            data = doc.tobytes(**save_options)
+            output_path.write(data)
+            span.set(bytes=len(data))
+
+def _merge_group(file_list, output_path, save_options, on_progress=None):
+    """Merge file_list into output_path (a path or a binary stream). Returns the skipped
+    (file, reason) pairs.
+
+    Nothing is written if no input could be merged.
+    """
+    merged_doc = fitz.open()
+    skipped = _insert_inputs(merged_doc, file_list, on_progress=on_progress)
+    if merged_doc.page_count:
+        _save_merged(merged_doc, output_path, save_options)
     merged_doc.close()
+    return skipped
+
+def _append_group(path, file_list, start):
+    # Append to the file at path with an incremental save and close it again, so only this
+    # group's objects are held in memory, however long the file has grown
+    exists = os.path.exists(path)
+    doc = fitz.open(path) if exists else fitz.open()
+    skipped = _insert_inputs(doc, file_list, start)
+    with metrics.span("save", pages=doc.page_count):
+        if exists:
+            doc.saveIncr()
+        elif doc.page_count:
+            doc.save(path)
+    doc.close()
+    return skipped
+
+@metrics.instrumented
+def merge_pdfs(file_list, output_path="merged.pdf", batch_size=None, workers=1, dedupe=False, optimize=False, on_progress=None):
+    """Merge PDFs in order. Returns (skipped, output_path); skipped lists (file, reason) pairs.
+
+    Without batch_size, every input is merged into one in-memory document, so memory grows
+    with the output. With batch_size, the output is built in a temp file by appending
+    batch_size inputs at a time with incremental saves, closing it after each, so peak
+    memory depends on batch_size rather than on the number of inputs. workers > 1 merges
+    the groups into intermediate files in parallel; they are appended in order.
+    dedupe stores identical objects (fonts, images shared by the inputs) once, and optimize
+    also cleans and compresses every stream. Both rewrite the whole output at the end and
+    compare every stream, which can take many times longer than the merge itself.
+    on_progress(done, total) is called per input file, or per group with batch_size.
+    Inputs may also be bytes or binary file objects; output_path may be a binary stream, or
+    None to get the merged PDF back as bytes in place of the path.
+    """
+    final_options = {"garbage": 4, "deflate": True} if dedupe else {}
+    if optimize:
+        final_options = OPTIMIZE_SAVE_OPTIONS
+    target = io.BytesIO() if output_path is None else output_path
+    result = lambda: target.getvalue() if output_path is None else output_path
+    if not batch_size or len(file_list) <= batch_size:
+        merged_doc = fitz.open()
+        skipped = _insert_inputs(merged_doc, file_list, on_progress=on_progress)
+        if not merged_doc.page_count:
+            merged_doc.close()
+            raise ValueError("None of the input files could be merged.")
+        _save_merged(merged_doc, target, final_options)
+        merged_doc.close()
+        return skipped, result()
+    if batch_size < 2:
+        raise ValueError("batch_size must be at least 2.")
+    if not all(_is_path(file) for file in file_list):
+        # File objects can't be handed to worker processes
+        workers = 1
+    
+    skipped = []
+    groups = [file_list[i:i + batch_size] for i in range(0, len(file_list), batch_size)]
+    tmp_dir = tempfile.mkdtemp(prefix="merge_", dir=os.path.dirname(os.path.abspath(output_path)) if _is_path(output_path) else None)
+    try:
+        merged_path = os.path.join(tmp_dir, "merged.pdf")
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            if pool:
+                outputs = [os.path.join(tmp_dir, f"group{n:06d}.pdf") for n in range(len(groups))]
+                parts = zip(outputs, pool.map(_merge_group, groups, outputs, [{}] * len(groups)))
+            else:
+                parts = ((None, None) for _ in groups)
+            for n, (group, (part, group_skipped)) in enumerate(zip(groups, parts)):
+                if part is None:
+                    skipped.extend(_append_group(merged_path, group, n * batch_size))
+                else:
+                    skipped.extend(group_skipped)
+                    if os.path.exists(part):
+                        _append_group(merged_path, [part], n * batch_size)
+                        os.remove(part)
+                if on_progress:
+                    on_progress(min((n + 1) * batch_size, len(file_list)), len(file_list))
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+        if not os.path.exists(merged_path):
+            raise ValueError("None of the input files could be merged.")
+        if final_options:
+            merged_doc = fitz.open(merged_path)
+            _save_merged(merged_doc, target, final_options)
+            merged_doc.close()
+        elif _is_path(target):
+            os.replace(merged_path, target)
+        else:
+            with open(merged_path, "rb") as f:
+                shutil.copyfileobj(f, target)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return skipped, result()
+
+# --- RENDERING ---
+
+RENDER_FORMATS = ("png", "jpeg", "webp")
+DEFAULT_RENDER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "doc-tor", "renders")
+
+def _render_page(index, output_path, dpi, fmt, rotation, thumbnail, quality, doc=None):
+    # Runs in a pool worker (using its open document) or inline with doc passed in
+    page = (doc or _worker_doc)[index]
+    if thumbnail:
+        # Fit the longest edge into `thumbnail` pixels
+        zoom = thumbnail / max(page.rect.width, page.rect.height)
+    else:
+        zoom = dpi / 72
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom).prerotate(rotation), alpha=False)
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    if fmt == "png":
+        pix.save(tmp_path, output="png")
+    elif fmt == "jpeg":
+        pix.save(tmp_path, output="jpeg", jpg_quality=quality)
+    else:
+        # PyMuPDF cannot encode WebP itself
+        pix.pil_save(tmp_path, format="WEBP", quality=quality)
+    os.replace(tmp_path, output_path)
     return output_path
 
-def redact_pdf(file_path, text_to_redact, output_path=None):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+def thumbnail_png(page, max_width, max_height):
+    """Render a page to PNG bytes fitting inside max_width x max_height pixels."""
+    zoom = min(max_width / page.rect.width, max_height / page.rect.height)
+    return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False).tobytes("png")
+
+def _open_thumbnail_doc(file_path):
+    # Runs in a worker process that keeps the document open for the _worker_thumbnail calls after it
+    _open_worker_doc(file_path)
+    return _worker_doc.page_count
+
+def _worker_thumbnail(index, max_width, max_height):
+    return thumbnail_png(_worker_doc[index], max_width, max_height)
+
+@metrics.instrumented
+def render_pages(file_path, pages=None, dpi=150, fmt="png", output_dir=None, workers=1, thumbnail=None, rotation=0, quality=85, cache_dir=None):
+    """Render pages to image files. Returns the written paths in page order.
+
+    thumbnail=N renders each page so its longest edge is N pixels (dpi is then ignored).
+    workers > 1 renders across a process pool; each worker opens the document once.
+    With a cache_dir (e.g. DEFAULT_RENDER_CACHE), rendered images are cached there keyed by
+    (file hash, page, size, rotation, format), so rendering the same pages again only copies
+    files. The cache has no size limit or eviction, so it is off by default.
+    In-memory input needs an output_dir and is rendered in this process.
+    """
+    file_path = _source(file_path)
+    if not _is_path(file_path):
+        if output_dir is None:
+            raise ValueError("An output directory is required for in-memory input.")
+        workers = 1
+    fmt = "jpeg" if fmt.lower() == "jpg" else fmt.lower()
+    if fmt not in RENDER_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Use one of: {', '.join(RENDER_FORMATS)}.")
+    if fmt == "webp":
+        try:
+            import PIL
+        except ImportError:
+            raise RuntimeError("WebP output needs Pillow (pip install pillow).")
+    ext = "jpg" if fmt == "jpeg" else fmt
     
-    doc = fitz.open(file_path)
+    doc = _open(file_path)
+    indices = list(_select_pages(pages, doc.page_count))
+    
+    base = _source_name(file_path)[0]
+    if output_dir is None:
+        output_dir = os.path.join(os.path.dirname(file_path), f"{base}_images")
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = [os.path.join(output_dir, f"{base}_page{i + 1:04d}.{ext}") for i in indices]
+    
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        size = f"t{thumbnail}" if thumbnail else f"d{dpi}"
+        key = file_hash(file_path)
+        targets = [os.path.join(cache_dir, f"{key}_p{i}_{size}_r{rotation}_q{quality}.{ext}") for i in indices]
+    else:
+        targets = outputs
+    
+    todo = [(i, target) for i, target in zip(indices, targets) if not (cache_dir and os.path.exists(target))]
+    metrics.current().set(pages=len(indices), cached=len(indices) - len(todo))
+    if workers <= 1 or len(todo) <= 1:
+        for i, target in todo:
+            _render_page(i, target, dpi, fmt, rotation, thumbnail, quality, doc)
+        doc.close()
+    else:
+        doc.close()
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), initializer=_open_worker_doc, initargs=(file_path,)) as pool:
+            n = len(todo)
+            list(pool.map(_render_page, [i for i, _ in todo], [t for _, t in todo], [dpi] * n, [fmt] * n, [rotation] * n, [thumbnail] * n, [quality] * n, chunksize=max(1, n // (workers * 4))))
+    
+    if cache_dir:
+        for target, output_path in zip(targets, outputs):
+            shutil.copyfile(target, output_path)
+    return outputs
+
+# --- TEXT SEARCH ---
+
+def _fold(text):
+    # Case-fold without changing string length, so offsets still line up with the page index
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+class _TermMatcher:
+    """Aho-Corasick automaton: finds every occurrence of many literal terms in one pass over a page.
+
+    Matching is case-insensitive, like page.search_for.
+    """
+
+    def __init__(self, terms):
+        self.terms = [t for t in terms if t]
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for term_id, term in enumerate(self.terms):
+            node = 0
+            for ch in _fold(term):
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[node][ch] = nxt
+                node = nxt
+            self.out[node].append(term_id)
+        
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def finditer(self, text):
+        """Yield (start, end, term_id) for every match in text."""
+        node = 0
+        for i, ch in enumerate(_fold(text)):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for term_id in self.out[node]:
+                yield i + 1 - len(self.terms[term_id]), i + 1, term_id
+
+def _page_char_index(page):
+    """Extract a page once into (text, chars, spans): the rawdict char and source span per character.
+
+    Line breaks are "\n" entries with no char, so matches never join separate lines.
+    """
+    text, chars, spans = [], [], []
+    for block in page.get_text("rawdict")["blocks"]:
+        if block["type"] != 0:
+            continue
+        for line in block["lines"]:
+            for span in line["spans"]:
+                for char in span["chars"]:
+                    text.append(char["c"])
+                    chars.append(char)
+                    spans.append(span)
+            text.append("\n")
+            chars.append(None)
+            spans.append(None)
+    return "".join(text), chars, spans
+
+def _match_rects(chars, start, end):
+    """Union the character boxes of text[start:end] into one rect per line."""
+    rects = []
+    current = None
+    for char in chars[start:end]:
+        if char is None:
+            if current is not None:
+                rects.append(current)
+            current = None
+            continue
+        bbox = fitz.Rect(char["bbox"])
+        current = bbox if current is None else current | bbox
+    if current is not None:
+        rects.append(current)
+    return rects
+
+def _find_matches(text, matcher=None, regexes=()):
+    """Yield (start, end, key) for literal terms (key = term id) and regexes (key = regex)."""
+    if matcher is not None:
+        yield from matcher.finditer(text)
+    for regex in regexes:
+        for m in regex.finditer(text):
+            if m.end() > m.start():
+                yield m.start(), m.end(), regex
+
+def _compile_regexes(regexes):
+    return [re.compile(r) if isinstance(r, str) else r for r in regexes or []]
+
+def load_terms(terms_file):
+    """Read redaction terms from a file, one per line ('#' starts a comment line)."""
+    with open(terms_file, encoding="utf-8") as f:
+        return [line.rstrip("\r\n") for line in f if line.strip() and not line.startswith("#")]
+
+def _redact(doc, text_to_redact, regexes=None, pages=None, on_progress=None):
+    """text_to_redact: a string or a list of strings. regexes: patterns matched case-sensitively.
+
+    on_progress(done, total) is called as pages are scanned.
+    """
+    terms = [text_to_redact] if isinstance(text_to_redact, str) else list(text_to_redact or [])
+    matcher = _TermMatcher(terms) if terms else None
+    regexes = _compile_regexes(regexes)
     count = 0
-    for page in doc:
-        areas = page.search_for(text_to_redact)
-        for area in areas:
-            page.add_redact_annot(area, fill=(0, 0, 0))
-            count += 1
-        page.apply_redactions()
+    search, apply = metrics.Span("search"), metrics.Span("apply_redactions")
+    selected = _select_pages(pages, doc.page_count)
+    for n, i in enumerate(selected):
+        if on_progress:
+            on_progress(n, len(selected))
+        with search:
+            page = doc[i]
+            text, chars, _ = _page_char_index(page)
+            areas = []
+            for start, end, _ in _find_matches(text, matcher, regexes):
+                areas.extend(_match_rects(chars, start, end))
+                count += 1
+            search.add(pages=1)
+        if not areas:
+            continue
+        with apply:
+            for area in areas:
+                page.add_redact_annot(area, fill=(0, 0, 0))
+            # One apply per page, however many terms matched
+            page.apply_redactions()
+            apply.add(pages=1, areas=len(areas))
+    if on_progress:
+        on_progress(len(selected), len(selected))
+    search.add(matches=count)
+    search.emit()
+    apply.emit()
+    return count
+
+def _indexed_pages(doc, file_path, terms, pages, index_db):
+    """Narrow a page selection to the pages the search index says may contain terms.
+
+    index_db: path of a search_index database, or True for the default one. Falls back to
+    the full selection when the index cannot answer for this file.
+    """
+    selected = _select_pages(pages, doc.page_count)
+    if not index_db or not _is_path(file_path):
+        return selected
+    import search_index
+    candidates = search_index.candidate_pages(file_path, terms, None if index_db is True else index_db)
+    if candidates is None:
+        return selected
+    candidates = set(candidates)
+    return [i for i in selected if i in candidates]
+
+def _ocr_layer(doc, file_path, pages, ocr, workers=None):
+    """Give the selected pages that have no text layer an invisible OCR one, so search,
+    redaction and extraction see scanned text. ocr: True or a Tesseract language.
+    Returns the OCRed page indices."""
+    import ocr as ocr_engine
+    language = ocr if isinstance(ocr, str) else ocr_engine.DEFAULT_LANGUAGE
+    source = file_path if _is_path(file_path) else None
+    return ocr_engine.ocr_document(doc, source, _select_pages(pages, doc.page_count), language, workers=workers)
+
+@metrics.instrumented
+def ocr_pdf(file_path, output_path=None, pages=None, language="eng", dpi=300, workers=None, optimize=False):
+    """Add an invisible OCR text layer to scanned pages (pages with images but no text),
+    making them searchable. Pages are OCRed across workers processes (default: CPU count)
+    and results are cached per page content. Returns (ocred_pages, output_path).
+    """
+    import ocr as ocr_engine
+    file_path = _source(file_path)
     
-    if output_path is None:
+    doc = _open(file_path)
+    try:
+        ocred = ocr_engine.ocr_document(doc, file_path if _is_path(file_path) else None, _select_pages(pages, doc.page_count), language, dpi, workers)
+    except BaseException:
+        doc.close()
+        raise
+    
+    if output_path is None and _is_path(file_path):
         base, ext = os.path.splitext(file_path)
-        output_path = f"{base}_redacted{ext}"
-        
-    doc.save(output_path)
-    doc.close()
-    return count, output_path
+        output_path = f"{base}_ocr{ext}"
+    
+    return len(ocred), _save(doc, file_path, output_path, optimize=optimize)
 
-def edit_pdf_text(file_path, old_text, new_text, output_path=None):
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File '{file_path}' not found.")
+@metrics.instrumented
+def redact_pdf(file_path, text_to_redact, output_path=None, regexes=None, in_place=False, incremental=False, pages=None, optimize=False, index_db=None, on_progress=None, ocr=None):
+    """text_to_redact: a string or list of literal terms; regexes: optional list of patterns.
+
+    index_db limits the scan to pages the search index lists for the terms (literal terms only).
+    on_progress(done, total) is called per page; raising from it abandons the redaction.
+    ocr (True or a Tesseract language) OCRs scanned pages first so their text is redacted
+    too; the invisible OCR text that is not redacted stays in the output.
+    """
+    file_path = _source(file_path)
     
-    doc = fitz.open(file_path)
+    doc = _open(file_path)
+    try:
+        # The search index only knows text layers, so scanned pages are always scanned
+        ocred = _ocr_layer(doc, file_path, pages, ocr) if ocr else []
+        if index_db and not regexes:
+            terms = [text_to_redact] if isinstance(text_to_redact, str) else list(text_to_redact or [])
+            pages = sorted(set(_indexed_pages(doc, file_path, terms, pages, index_db)) | set(ocred))
+        count = _redact(doc, text_to_redact, regexes, pages, on_progress)
+    except BaseException:
+        doc.close()
+        raise
+    
+    if output_path is None and _is_path(file_path):
+        base, ext = os.path.splitext(file_path)
+        output_path = f"{base}_redacted{ext}"
+    
+    # Never incremental: the original content streams, text included, would stay in the file
+    return count, _save(doc, file_path, output_path, in_place, incremental, full=True, optimize=optimize)
+
+# Base-14 fonts by (serif, mono) and (bold, italic), used to approximate the replaced span's font
+_BASE14 = {
+    (False, False): ("helv", "hebo", "heit", "hebi"),
+    (True, False): ("tiro", "tibo", "tiit", "tibi"),
+    (False, True): ("cour", "cobo", "coit", "cobi"),
+    (True, True): ("cour", "cobo", "coit", "cobi"),
+}
+
+def _base14_font(span):
+    flags = span["flags"]
+    family = _BASE14[(bool(flags & fitz.TEXT_FONT_SERIFED), bool(flags & fitz.TEXT_FONT_MONOSPACED))]
+    return family[bool(flags & fitz.TEXT_FONT_BOLD) + 2 * bool(flags & fitz.TEXT_FONT_ITALIC)]
+
+def _replacement_pairs(old_text, new_text):
+    if isinstance(old_text, str):
+        if new_text is None:
+            # Without this, a forgotten argument would silently white the text out
+            raise ValueError("new_text is required when old_text is a string.")
+        return [(old_text, new_text)]
+    if isinstance(old_text, dict):
+        return list(old_text.items())
+    return [tuple(pair) for pair in old_text]
+
+def _edit(doc, old_text, new_text=None, pages=None, on_progress=None):
+    """old_text: a string replaced by new_text, or a dict / list of (old, new) pairs.
+
+    on_progress(done, total) is called as pages are scanned.
+    """
+    pairs = _replacement_pairs(old_text, new_text)
+    matcher = _TermMatcher([old for old, _ in pairs])
+    replacements = [new for old, new in pairs if old]
     count = 0
-    for page in doc:
-        areas = page.search_for(old_text)
-        for rect in areas:
-            # Redact (white out)
-            page.add_redact_annot(rect, fill=(1, 1, 1)) 
-            page.apply_redactions()
-            # Insert new text
-            page.insert_textbox(rect, new_text, color=(0, 0, 0), fontsize=11)
-            count += 1
+    search, apply, insert = metrics.Span("search"), metrics.Span("apply_redactions"), metrics.Span("insert_text")
+    selected = _select_pages(pages, doc.page_count)
+    for n, i in enumerate(selected):
+        if on_progress:
+            on_progress(n, len(selected))
+        with search:
+            page = doc[i]
+            text, chars, spans = _page_char_index(page)
+            # Longest match wins where terms overlap
+            matches = sorted(matcher.finditer(text), key=lambda m: (m[0], m[0] - m[1]))
+            inserts = []
+            last_end = 0
+            for start, end, term_id in matches:
+                if start < last_end:
+                    continue
+                last_end = end
+                rects = _match_rects(chars, start, end)
+                for rect in rects:
+                    # Redact (white out)
+                    page.add_redact_annot(rect, fill=(1, 1, 1))
+                span = spans[start]
+                inserts.append((chars[start]["origin"], replacements[term_id], span))
+            search.add(pages=1, matches=len(inserts))
+        if not inserts:
+            continue
+        with apply:
+            # One content-stream rewrite per page instead of one per match; leave images untouched
+            page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+            apply.add(pages=1)
+        with insert:
+            for origin, new, span in inserts:
+                # Insert new text on the original baseline, approximating the original font
+                page.insert_text(origin, new, fontsize=span["size"], fontname=_base14_font(span), color=fitz.sRGB_to_pdf(span["color"]))
+                count += 1
+            insert.add(matches=len(inserts))
+    if on_progress:
+        on_progress(len(selected), len(selected))
+    for phase in (search, apply, insert):
+        phase.emit()
+    return count
+
+def load_replacements(pairs_file):
+    """Read old/new pairs from a file, one tab-separated pair per line."""
+    pairs = []
+    with open(pairs_file, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            old, sep, new = line.partition("\t")
+            if not sep:
+                raise ValueError(f"Expected a tab-separated 'old<TAB>new' pair, got '{line}'.")
+            pairs.append((old, new))
+    return pairs
+
+@metrics.instrumented
+def edit_pdf_text(file_path, old_text, new_text=None, output_path=None, in_place=False, incremental=False, pages=None, optimize=False, index_db=None, on_progress=None, ocr=None):
+    """old_text: a string replaced by new_text, or a dict / list of (old, new) pairs.
+
+    index_db limits the scan to pages the search index lists for the old texts.
+    on_progress(done, total) is called per page; raising from it abandons the edit.
+    ocr: OCR scanned pages first, as for redact_pdf.
+    """
+    file_path = _source(file_path)
+    olds = [old for old, _ in _replacement_pairs(old_text, new_text)]
+    
+    doc = _open(file_path)
+    try:
+        ocred = _ocr_layer(doc, file_path, pages, ocr) if ocr else []
+        if index_db:
+            pages = sorted(set(_indexed_pages(doc, file_path, olds, pages, index_db)) | set(ocred))
+        count = _edit(doc, old_text, new_text, pages, on_progress)
+    except BaseException:
+        doc.close()
+        raise
             
-    if output_path is None:
+    if output_path is None and _is_path(file_path):
         base, ext = os.path.splitext(file_path)
         output_path = f"{base}_edited{ext}"
-        
-    doc.save(output_path)
-    doc.close()
-    return count, output_path
+    
+    return count, _save(doc, file_path, output_path, in_place, incremental, optimize=optimize)
+
+# --- PIPELINE ---
+
+class Pipeline:
+    """Chain page operations on one loaded document and save it once.
+
+    Pipeline("in.pdf").rotate(90).delete([1, 4]).redact("SSN").encrypt("pw").save("out.pdf")
+    """
+
+    def __init__(self, file_path):
+        file_path = _source(file_path)
+        self.file_path = file_path
+        self.doc = _open(file_path)
+        self.save_options = {}
+        self.counts = {}
+        # Set by steps whose result must not be written as an incremental update
+        self.full_save = False
+
+    def decrypt(self, password):
+        if self.doc.is_encrypted and not self.doc.authenticate(password):
+            raise ValueError("Incorrect password.")
+        self.full_save = True
+        return self
+
+    def rotate(self, rotation, pages=None):
+        _rotate(self.doc, rotation, pages)
+        return self
+
+    def delete(self, pages_to_delete):
+        """pages_to_delete: page spec string or list of integers (0-based index)"""
+        _delete(self.doc, pages_to_delete)
+        self.full_save = True
+        return self
+
+    def select(self, pages):
+        """Keep only the selected pages (page spec or 0-based indices), in that order."""
+        self.doc.select(list(_select_pages(pages, self.doc.page_count)))
+        self.full_save = True
+        return self
+
+    def extract_range(self, start_page, end_page):
+        """Keep only the 1-based start..end pages."""
+        return self.select(f"{start_page}-{end_page}")
+
+    def redact(self, text_to_redact, regexes=None, pages=None):
+        self.counts["redact"] = self.counts.get("redact", 0) + _redact(self.doc, text_to_redact, regexes, pages)
+        self.full_save = True
+        return self
+
+    def edit(self, old_text, new_text=None, pages=None):
+        self.counts["edit"] = self.counts.get("edit", 0) + _edit(self.doc, old_text, new_text, pages)
+        return self
+
+    def encrypt(self, password):
+        # Encryption is applied by the single save at the end
+        self.save_options = {"encryption": fitz.PDF_ENCRYPT_AES_256, "owner_pw": password, "user_pw": password}
+        return self
+
+    def save(self, output_path=None, in_place=False, incremental=False, optimize=False):
+        if output_path is None and _is_path(self.file_path):
+            base, ext = os.path.splitext(self.file_path)
+            output_path = f"{base}_processed{ext}"
+        return _save(self.doc, self.file_path, output_path, in_place, incremental, self.full_save, optimize, **self.save_options)
+
+PIPELINE_STEPS = ("decrypt", "rotate", "delete", "select", "extract_range", "redact", "edit", "encrypt")
+
+@metrics.instrumented
+def run_pipeline(file_path, steps, output_path=None, in_place=False, incremental=False, optimize=False):
+    """steps: list of (name, args) tuples, applied in order before a single save.
+
+    Returns (counts, output_path).
+    """
+    pipeline = Pipeline(file_path)
+    try:
+        for name, args in steps:
+            if name not in PIPELINE_STEPS:
+                raise ValueError(f"Unknown step '{name}'. Use one of: {', '.join(PIPELINE_STEPS)}.")
+            getattr(pipeline, name)(*args)
+    except Exception:
+        pipeline.doc.close()
+        raise
+    return pipeline.counts, pipeline.save(output_path, in_place, incremental, optimize)
+
+# --- BATCH PROCESSING ---
+
+# name -> (function, output suffix used when an output directory is given)
+BATCH_OPERATIONS = {
+    "info": (get_pdf_info, None),
+    "extract": (extract_text_from_pdf, ".txt"),
+    "pdf-to-word": (convert_pdf_to_word, ".docx"),
+    "rotate": (rotate_pages, "_rotated.pdf"),
+    "delete": (delete_pages, "_deleted.pdf"),
+    "split": (extract_page_range, "_pages.pdf"),
+    "extract-pages": (extract_pages, "_pages.pdf"),
+    "burst": (split_pdf, None),
+    "render": (render_pages, None),
+    "encrypt": (encrypt_pdf, "_encrypted.pdf"),
+    "decrypt": (decrypt_pdf, "_decrypted.pdf"),
+    "optimize": (optimize_pdf, "_optimized.pdf"),
+    "ocr": (ocr_pdf, "_ocr.pdf"),
+    "redact": (redact_pdf, "_redacted.pdf"),
+    "edit": (edit_pdf_text, "_edited.pdf"),
+    "pipeline": (run_pipeline, "_processed.pdf"),
+}
+# Operations writing several files: with an output_dir, each input gets its own subdirectory
+BATCH_DIR_OPERATIONS = {"burst", "render"}
+
+def collect_inputs(source, pattern="*.pdf"):
+    """Resolve a directory, glob pattern or manifest file ("-" for stdin) to a list of files."""
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "**", pattern), recursive=True))
+    if source == "-" or (os.path.isfile(source) and not source.lower().endswith(".pdf")):
+        return read_manifest(source)
+    return sorted(glob.glob(source, recursive=True))
+
+def _load_checkpoint(checkpoint):
+    done = {}
+    if checkpoint and os.path.exists(checkpoint):
+        with open(checkpoint, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue # Partially written last line from an interrupted run
+                done[entry["file"]] = entry
+    return done
+
+def _output_dirs(inputs, output_dir):
+    """Output directory of each input: its folder relative to the inputs' common folder,
+    mirrored under output_dir (or its own folder without one), so same-named files from
+    different folders stay apart. Raises ValueError for inputs that would still collide."""
+    dirs = [os.path.dirname(os.path.abspath(f)) for f in inputs]
+    if not dirs:
+        return {}
+    if output_dir:
+        root = os.path.commonpath(dirs)
+        out_dirs = {f: os.path.normpath(os.path.join(output_dir, os.path.relpath(d, root))) for f, d in zip(inputs, dirs)}
+    else:
+        out_dirs = dict(zip(inputs, dirs))
+    # What is left to collide is names differing only in extension, e.g. x.pdf and x.PDF
+    seen = {}
+    for f in dict.fromkeys(inputs):
+        key = os.path.normcase(os.path.join(out_dirs[f], os.path.splitext(os.path.basename(f))[0]))
+        if key in seen:
+            raise ValueError(f"'{seen[key]}' and '{f}' would write the same output file.")
+        seen[key] = f
+    return out_dirs
+
+def _run_batch_item(operation, file_path, options, output_dir):
+    # Runs in a worker process; errors are captured per file instead of stopping the batch.
+    # output_dir is this file's own output directory
+    func, suffix = BATCH_OPERATIONS[operation]
+    kwargs = dict(options)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    if output_dir and suffix:
+        os.makedirs(output_dir, exist_ok=True)
+        kwargs["output_path"] = os.path.join(output_dir, name + suffix)
+    elif output_dir and operation in BATCH_DIR_OPERATIONS:
+        kwargs.setdefault("output_dir", os.path.join(output_dir, name))
+    try:
+        result = func(file_path, **kwargs)
+        return {"file": file_path, "status": "ok", "result": result}
+    except Exception as e:
+        return {"file": file_path, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+@metrics.instrumented
+def run_batch(inputs, operation, options=None, workers=None, checkpoint=None, output_dir=None, on_result=None):
+    """Run one pdf_ops operation over many files with a bounded process pool.
+
+    inputs: list of paths, or a directory / glob / manifest accepted by collect_inputs.
+    options: keyword arguments passed to the operation for every file.
+    checkpoint: JSON-lines file of finished items; files already marked "ok" are skipped,
+    so an interrupted batch can be resumed by running it again.
+    output_dir mirrors the input folders below their common folder, so a/x.pdf and b/x.pdf
+    get separate outputs; inputs that would still write the same file raise ValueError.
+    Returns a summary dict with per-file results.
+    """
+    if operation not in BATCH_OPERATIONS:
+        raise ValueError(f"Unknown operation '{operation}'. Use one of: {', '.join(BATCH_OPERATIONS)}.")
+    if isinstance(inputs, str):
+        inputs = collect_inputs(inputs)
+    options = options or {}
+    workers = workers or os.cpu_count() or 1
+    out_dirs = {}
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        out_dirs = _output_dirs(inputs, output_dir)
+    
+    done = _load_checkpoint(checkpoint)
+    todo = [f for f in inputs if done.get(f, {}).get("status") != "ok"]
+    summary = {"operation": operation, "total": len(inputs), "skipped": len(inputs) - len(todo), "succeeded": 0, "failed": 0, "results": []}
+    
+    ckpt = open(checkpoint, "a", encoding="utf-8") if checkpoint else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Bound the number of queued files so huge batches do not pile up in memory
+            todo_iter = iter(todo)
+            pending = set()
+            while True:
+                for file_path in todo_iter:
+                    pending.add(pool.submit(_run_batch_item, operation, file_path, options, out_dirs.get(file_path)))
+                    if len(pending) >= workers * 4:
+                        break
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    entry = future.result()
+                    summary["succeeded" if entry["status"] == "ok" else "failed"] += 1
+                    summary["results"].append(entry)
+                    if ckpt:
+                        ckpt.write(json.dumps(entry, default=str) + "\n")
+                        ckpt.flush()
+                    if on_result:
+                        on_result(entry)
+    finally:
+        if ckpt:
+            ckpt.close()
+    
+    return summary
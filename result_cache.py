@@ -0,0 +1,183 @@
+"""On-disk cache of operation results, addressed by content.
+
+A result is stored under the hash of (input content, operation, parameters, versions of
+the libraries that produce it), so the same document submitted again under another name
+costs one hash pass and a file copy. The content hash of a path is remembered per
+(size, mtime), so an unchanged file is not even re-read. Entries are evicted least
+recently used first once the cache grows past max_bytes.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+from importlib import metadata
+
+import pdf_ops
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "doc-tor", "results")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    file TEXT,
+    value TEXT,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS hashes (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, sha256 TEXT NOT NULL);
+"""
+
+# Libraries whose version can change an operation's output
+LIBRARIES = {"pdf-to-word": ("pymupdf", "pdf2docx", "python-docx")}
+DEFAULT_LIBRARIES = ("pymupdf",)
+
+def _version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+class ResultCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite"), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def content_hash(self, file_path):
+        """SHA-256 of the input (a path or in-memory PDF data)."""
+        if not isinstance(file_path, (str, os.PathLike)):
+            return pdf_ops.file_hash(file_path)
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT size, mtime_ns, sha256 FROM hashes WHERE path = ?", (path,)).fetchone()
+            if row and row[:2] == (st.st_size, st.st_mtime_ns):
+                return row[2]
+            digest = pdf_ops.file_hash(path)
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                             (path, st.st_size, st.st_mtime_ns, digest))
+        return digest
+
+    def key(self, file_path, operation, params=None):
+        versions = {name: _version(name) for name in LIBRARIES.get(operation, DEFAULT_LIBRARIES)}
+        data = json.dumps([self.content_hash(file_path), operation, params or {}, versions], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key):
+        # Returns (file, value) of the entry, or None; counts the hit or miss either way
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT file, value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row and row[0] and not os.path.exists(os.path.join(self.cache_dir, row[0])):
+                with conn:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            with conn:
+                if row:
+                    conn.execute("UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+                conn.execute("INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                             ("hits" if row else "misses",))
+        return row
+
+    def _add(self, key, operation, file, value, size):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO entries (key, operation, file, value, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (key, operation, file, value, size, now, now))
+            self._evict(conn)
+
+    def get_file(self, key, output_path):
+        """Copy the cached result file to output_path. Returns False on a miss."""
+        row = self._lookup(key)
+        if not row or not row[0]:
+            return False
+        shutil.copyfile(os.path.join(self.cache_dir, row[0]), output_path)
+        return True
+
+    def put_file(self, key, operation, path):
+        name = os.path.join("objects", key[:2], key + os.path.splitext(path)[1])
+        target = os.path.join(self.cache_dir, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Copied under a temp name so a concurrent reader never sees half a file
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, target)
+        self._add(key, operation, name, None, os.path.getsize(target))
+
+    def get_value(self, key):
+        """The cached JSON value, or None on a miss."""
+        row = self._lookup(key)
+        return json.loads(row[1]) if row and row[1] is not None else None
+
+    def put_value(self, key, operation, value):
+        data = json.dumps(value)
+        self._add(key, operation, None, data, len(data))
+
+    def _remove(self, conn, key, file):
+        if file:
+            try:
+                os.remove(os.path.join(self.cache_dir, file))
+            except FileNotFoundError:
+                pass
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        with conn:
+            for key, file, size in conn.execute("SELECT key, file, size FROM entries ORDER BY last_used").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._remove(conn, key, file)
+                total -= size
+                evicted += 1
+            conn.execute("INSERT INTO counters (name, value) VALUES ('evictions', ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+                         (evicted, evicted))
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+            operations = {op: {"entries": n, "bytes": size, "hits": hits} for op, n, size, hits in conn.execute(
+                "SELECT operation, COUNT(*), SUM(size), SUM(hits) FROM entries GROUP BY operation ORDER BY operation")}
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "cache_dir": self.cache_dir,
+            "entries": sum(op["entries"] for op in operations.values()),
+            "bytes": sum(op["bytes"] for op in operations.values()),
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            "evictions": counters.get("evictions", 0),
+            "operations": operations,
+        }
+
+    def clear(self):
+        """Remove every entry and reset the statistics. Returns the number of entries removed."""
+        with closing(self._connect()) as conn:
+            with conn:
+                entries = [row for row in conn.execute("SELECT key, file FROM entries")]
+                for key, file in entries:
+                    self._remove(conn, key, file)
+                conn.execute("DELETE FROM counters")
+                conn.execute("DELETE FROM hashes")
+        shutil.rmtree(os.path.join(self.cache_dir, "objects"), ignore_errors=True)
+        return len(entries)
@@ -0,0 +1,199 @@
+import json
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pymupdf as fitz
+
+from catalog import find_pdfs, open_db, under_dir
+
+DEFAULT_DB = os.path.join(os.path.expanduser("~"), ".cache", "doc-tor", "search.sqlite")
+
+# The trigram tokenizer matches substrings case-insensitively, like page.search_for,
+# so the index can also tell redact/edit which pages may contain a term
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    pages INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS page_text USING fts5(text, file_id UNINDEXED, page UNINDEXED, tokenize='trigram');
+CREATE TABLE IF NOT EXISTS page_words (id INTEGER PRIMARY KEY, words TEXT NOT NULL);
+"""
+
+# Trigram queries need at least three characters per term
+MIN_TERM_LENGTH = 3
+
+def connect(db_path=None):
+    return open_db(db_path or DEFAULT_DB, SCHEMA)
+
+def _extract_pages(path):
+    # Runs in a worker process: page text plus word boxes for hit rectangles
+    doc = fitz.open(path)
+    pages = []
+    for page in doc:
+        words = [[round(w[0], 1), round(w[1], 1), round(w[2], 1), round(w[3], 1), w[4]] for w in page.get_text("words")]
+        pages.append((page.number, page.get_text(), json.dumps(words)))
+    doc.close()
+    return path, pages
+
+def _extracted(paths, workers):
+    """Yield (path, pages, error) per path, in completion order. At most workers * 2 files
+    are in flight, so finished extractions never pile up ahead of the writer."""
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                yield path, _extract_pages(path)[1], None
+            except Exception as e:
+                yield path, None, e
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        todo = iter(paths)
+        pending = {}
+        while True:
+            for path in todo:
+                pending[pool.submit(_extract_pages, path)] = path
+                if len(pending) >= workers * 2:
+                    break
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path = pending.pop(future)
+                try:
+                    yield path, future.result()[1], None
+                except Exception as e:
+                    yield path, None, e
+
+def _remove_file(conn, file_id):
+    rowids = [(r[0],) for r in conn.execute("SELECT rowid FROM page_text WHERE file_id = ?", (file_id,))]
+    conn.executemany("DELETE FROM page_text WHERE rowid = ?", rowids)
+    conn.executemany("DELETE FROM page_words WHERE id = ?", rowids)
+    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+def build_index(root, db_path=None, workers=None, on_progress=None):
+    """Index the text of every PDF under root. Only new or changed files (by size and
+    mtime) are extracted; files that disappeared are dropped from the index.
+
+    Returns (indexed, unchanged, removed, failed) where failed lists (path, error).
+    """
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"Directory '{root}' not found.")
+
+    conn = connect(db_path)
+    condition, args = under_dir("path", root)
+    known = {path: (file_id, size, mtime_ns) for file_id, path, size, mtime_ns in conn.execute(
+        f"SELECT id, path, size, mtime_ns FROM files WHERE {condition}", args)}
+
+    seen = set()
+    changed = {}
+    for path in find_pdfs(root):
+        st = os.stat(path)
+        seen.add(path)
+        hit = known.get(path)
+        if not hit or hit[1:] != (st.st_size, st.st_mtime_ns):
+            changed[path] = st
+
+    removed = [path for path in known if path not in seen]
+    with conn:
+        for path in removed:
+            _remove_file(conn, known[path][0])
+
+    failed = []
+    for done, (path, pages, error) in enumerate(_extracted(list(changed), workers), 1):
+        if error:
+            failed.append((path, f"{type(error).__name__}: {error}"))
+        else:
+            # One transaction per file, so an interrupted run keeps what it finished
+            with conn:
+                if path in known:
+                    _remove_file(conn, known[path][0])
+                st = changed[path]
+                file_id = conn.execute("INSERT INTO files (path, size, mtime_ns, pages) VALUES (?, ?, ?, ?)",
+                                       (path, st.st_size, st.st_mtime_ns, len(pages))).lastrowid
+                for page, text, words in pages:
+                    rowid = conn.execute("INSERT INTO page_text (text, file_id, page) VALUES (?, ?, ?)", (text, file_id, page)).lastrowid
+                    conn.execute("INSERT INTO page_words (id, words) VALUES (?, ?)", (rowid, words))
+            # Dropped before the next file is taken, so only the window of results is held
+            pages = None
+        if on_progress:
+            on_progress(done, len(changed))
+    conn.close()
+    return len(changed) - len(failed), len(seen) - len(changed), len(removed), failed
+
+def _query_terms(query):
+    """Plain terms of an FTS query (phrases kept whole), used to find the words to highlight."""
+    terms = []
+    for phrase, word in re.findall(r'"([^"]+)"|([^\s"()*]+)', query):
+        if word and word.upper() in ("AND", "OR", "NOT", "NEAR"):
+            continue
+        terms.append(" ".join((phrase or word).lower().split()))
+    return [t for t in terms if t]
+
+def _hit_rects(words_json, terms):
+    # Find each term in the page's words joined by single spaces, as the trigram index
+    # matches it, and highlight only the words an occurrence overlaps
+    words = json.loads(words_json)
+    spans = []
+    offset = 0
+    for *_, word in words:
+        spans.append((offset, offset + len(word)))
+        offset += len(word) + 1
+    text = " ".join(word for *_, word in words).lower()
+    hit = set()
+    for term in terms:
+        start = text.find(term)
+        while start != -1:
+            end = start + len(term)
+            hit.update(i for i, (w0, w1) in enumerate(spans) if w0 < end and start < w1)
+            start = text.find(term, start + 1)
+    return [list(words[i][:4]) for i in sorted(hit)]
+
+def search(query, db_path=None, limit=50, path_prefix=None):
+    """Run an FTS5 query over the index. Returns hits as dicts with path, page (1-based),
+    snippet and rects (word boxes of the matched terms, in PDF points).
+
+    Terms match as substrings and need at least three characters.
+    """
+    conn = connect(db_path)
+    sql = ("SELECT files.path, page_text.page, snippet(page_text, 0, '[', ']', '...', 12), page_words.words "
+           "FROM page_text JOIN files ON files.id = page_text.file_id JOIN page_words ON page_words.id = page_text.rowid "
+           "WHERE page_text MATCH ?")
+    args = [query]
+    if path_prefix:
+        condition, bounds = under_dir("files.path", path_prefix)
+        sql += " AND " + condition
+        args += bounds
+    sql += " ORDER BY rank LIMIT ?"
+    args.append(limit)
+    terms = _query_terms(query)
+    try:
+        hits = [{"path": path, "page": page + 1, "snippet": " ".join(snippet.split()), "rects": _hit_rects(words, terms)}
+                for path, page, snippet, words in conn.execute(sql, args)]
+    finally:
+        conn.close()
+    return hits
+
+def candidate_pages(file_path, terms, db_path=None):
+    """0-based pages of file_path that may contain any of the literal terms, or None when
+    the index cannot answer (file not indexed or changed since, or a term too short)."""
+    if not terms or any(len(t) < MIN_TERM_LENGTH for t in terms):
+        return None
+    if not os.path.exists(db_path or DEFAULT_DB):
+        return None
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    conn = connect(db_path)
+    try:
+        row = conn.execute("SELECT id, size, mtime_ns FROM files WHERE path = ?", (path,)).fetchone()
+        if not row or row[1:] != (st.st_size, st.st_mtime_ns):
+            return None
+        query = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        pages = {page for (page,) in conn.execute(
+            "SELECT page FROM page_text WHERE page_text MATCH ? AND file_id = ?", (query, row[0]))}
+    finally:
+        conn.close()
+    return sorted(pages)
@@ -0,0 +1,351 @@
+import asyncio
+import http.client
+import inspect
+import json
+import os
+import signal
+import socket
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import pymupdf as fitz
+
+import pdf_ops
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 16 * 1024 * 1024
+
+# --- WORKER SIDE ---
+
+# Open documents of this worker process, keyed by (path, mtime_ns, size) so a file that
+# changes on disk is reopened rather than served stale
+_docs = OrderedDict()
+_doc_cache_size = 16
+
+def _init_worker(doc_cache_size):
+    global _doc_cache_size
+    _doc_cache_size = doc_cache_size
+
+def _cached_doc(file_path):
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File '{file_path}' not found.")
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    doc = _docs.pop(key, None)
+    if doc is None:
+        for stale in [k for k in _docs if k[0] == path]:
+            _docs.pop(stale).close()
+        doc = fitz.open(path)
+    _docs[key] = doc
+    while len(_docs) > _doc_cache_size:
+        _docs.popitem(last=False)[1].close()
+    return doc
+
+def _info(file_path):
+    return pdf_ops._doc_info(_cached_doc(file_path))
+
+def _extract(file_path, pages=None, mode="text"):
+    """Page text is returned in the response instead of being written to a file."""
+    if mode not in pdf_ops.PAGE_TEXT_MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Use one of: {', '.join(pdf_ops.PAGE_TEXT_MODES)}.")
+    doc = _cached_doc(file_path)
+    return [{"page": i + 1, "text": pdf_ops._page_text(doc[i], mode)} for i in pdf_ops._select_pages(pages, doc.page_count)]
+
+def _render(file_path, pages=None, dpi=150, fmt="png", output_dir=None, thumbnail=None, rotation=0, quality=85):
+    fmt = "jpeg" if fmt.lower() == "jpg" else fmt.lower()
+    if fmt not in ("png", "jpeg"):
+        raise ValueError("The server renders png or jpeg.")
+    doc = _cached_doc(file_path)
+    base = os.path.splitext(os.path.basename(file_path))[0]
+    if output_dir is None:
+        output_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), f"{base}_images")
+    os.makedirs(output_dir, exist_ok=True)
+    ext = "jpg" if fmt == "jpeg" else fmt
+    return [pdf_ops._render_page(i, os.path.join(output_dir, f"{base}_page{i + 1:04d}.{ext}"), dpi, fmt, rotation, thumbnail, quality, doc)
+            for i in pdf_ops._select_pages(pages, doc.page_count)]
+
+# Read-only operations served from the worker's open documents; everything else in
+# pdf_ops.BATCH_OPERATIONS runs as usual (it opens and writes files itself)
+DOC_OPERATIONS = {"info": _info, "extract": _extract, "render": _render}
+
+# Operations that never write files; the rest need Server(allow_writes=True)
+READ_ONLY_OPERATIONS = {"info", "extract"}
+# Parameters ending in these name a file or directory (file_path, work_dir, index_db, ...);
+# every one in an operation's signature is confined to the served root
+PATH_PARAM_SUFFIXES = ("_path", "_dir", "_db")
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+def operations():
+    return sorted(set(DOC_OPERATIONS) | set(pdf_ops.BATCH_OPERATIONS))
+
+def path_params(operation):
+    """The path-typed parameters of an operation, read from its function's signature."""
+    func = DOC_OPERATIONS.get(operation) or pdf_ops.BATCH_OPERATIONS[operation][0]
+    return [name for name in inspect.signature(func).parameters if name.endswith(PATH_PARAM_SUFFIXES)]
+
+def _call(operation, params):
+    # Runs in a worker process
+    params = dict(params)
+    file_path = params.pop("file_path")
+    func = DOC_OPERATIONS.get(operation) or pdf_ops.BATCH_OPERATIONS[operation][0]
+    return func(file_path, **params)
+
+# --- SERVER SIDE ---
+
+class Server:
+    """Local JSON API over HTTP (TCP or a Unix socket) in front of a worker process pool.
+
+    POST /ops/<operation> with a JSON object of arguments (file_path plus the keyword
+    arguments of the pdf_ops function) returns {"result": ...} or {"error": ...}.
+    GET /health and GET /stats report liveness and counters.
+
+    At most max_concurrency requests run at once and up to max_pending more wait for a
+    slot; beyond that requests are refused with 503 so callers can back off.
+
+    Only local, non-browser clients are served: requests must be application/json, carry
+    no Origin header and name a local Host, so a web page cannot drive the server.
+    Operations that write files are refused unless allow_writes is set. With a root,
+    every path argument must lie inside it.
+    """
+
+    def __init__(self, workers=None, max_concurrency=None, max_pending=64, doc_cache_size=16, allow_writes=False, root=None):
+        self.allow_writes = allow_writes
+        self.root = os.path.realpath(root) if root else None
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self.max_pending = max_pending
+        self.doc_cache_size = doc_cache_size
+        self.pool = self._new_pool()
+        self.in_flight = 0
+        self.waiting = 0
+        self.counts = Counter()
+        self.seconds = Counter()
+        self.started = time.time()
+        self._slots = None
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.doc_cache_size,))
+
+    def stats(self):
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "requests": dict(self.counts),
+            "seconds": {op: round(s, 3) for op, s in self.seconds.items()},
+        }
+
+    async def run_operation(self, operation, params):
+        if self.in_flight + self.waiting >= self.max_concurrency + self.max_pending:
+            self.counts["rejected"] += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Server busy, retry later."}
+        self.waiting += 1
+        async with self._slots:
+            self.waiting -= 1
+            self.in_flight += 1
+            start = time.perf_counter()
+            pool = self.pool
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(pool, _call, operation, params)
+                return HTTPStatus.OK, {"result": result}
+            except BrokenProcessPool:
+                # A worker died (e.g. crashed in MuPDF); start a fresh pool for later requests
+                if self.pool is pool:
+                    self.pool = self._new_pool()
+                self.counts["errors"] += 1
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Worker process crashed."}
+            except FileNotFoundError as e:
+                self.counts["errors"] += 1
+                return HTTPStatus.NOT_FOUND, {"error": str(e)}
+            except Exception as e:
+                self.counts["errors"] += 1
+                return HTTPStatus.BAD_REQUEST, {"error": f"{type(e).__name__}: {e}"}
+            finally:
+                self.in_flight -= 1
+                self.counts[operation] += 1
+                self.seconds[operation] += time.perf_counter() - start
+
+    def check_request(self, headers):
+        """Refuse browser-originated requests. Returns an error response, or None."""
+        if "origin" in headers:
+            return HTTPStatus.FORBIDDEN, {"error": "Cross-origin requests are not allowed."}
+        host = headers.get("host", "")
+        hostname = host.rsplit(":", 1)[0] if not host.startswith("[") else host[1:].split("]")[0]
+        if hostname not in LOCAL_HOSTS:
+            return HTTPStatus.FORBIDDEN, {"error": f"Host '{host}' is not allowed."}
+        return None
+
+    def check_operation(self, operation, params):
+        """Enforce allow_writes and root. Returns an error response, or None."""
+        if operation not in READ_ONLY_OPERATIONS and not self.allow_writes:
+            return HTTPStatus.FORBIDDEN, {"error": f"'{operation}' writes files; start the server with --allow-writes."}
+        if params.get("in_place") and not self.allow_writes:
+            return HTTPStatus.FORBIDDEN, {"error": "in_place needs --allow-writes."}
+        if params.get("cache"):
+            # The result cache lives in the user's cache directory, outside any root
+            return HTTPStatus.FORBIDDEN, {"error": "cache is not available through the server."}
+        for key in path_params(operation):
+            value = params.get(key)
+            if value is None or isinstance(value, bool):
+                continue
+            if not isinstance(value, str):
+                return HTTPStatus.BAD_REQUEST, {"error": f"{key} must be a string."}
+            if self.root:
+                path = os.path.realpath(value)
+                if os.path.commonpath([self.root, path]) != self.root:
+                    return HTTPStatus.FORBIDDEN, {"error": f"{key} '{value}' is outside the served root."}
+        return None
+
+    async def dispatch(self, method, target, body, headers=None):
+        headers = headers or {}
+        refused = self.check_request(headers)
+        if refused:
+            return refused
+        path = urlsplit(target).path.rstrip("/")
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"ok": True, "operations": operations()}
+        if method == "GET" and path == "/stats":
+            return HTTPStatus.OK, self.stats()
+        if not path.startswith("/ops/"):
+            return HTTPStatus.NOT_FOUND, {"error": f"No such endpoint '{path}'."}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST."}
+        if headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+            return HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "Content-Type must be application/json."}
+        operation = path[len("/ops/"):]
+        if operation not in DOC_OPERATIONS and operation not in pdf_ops.BATCH_OPERATIONS:
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown operation '{operation}'. Choose from: {', '.join(operations())}."}
+        try:
+            params = json.loads(body or b"{}")
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e}"}
+        if not isinstance(params, dict) or "file_path" not in params:
+            return HTTPStatus.BAD_REQUEST, {"error": "Expected a JSON object with a file_path."}
+        refused = self.check_operation(operation, params)
+        if refused:
+            self.counts["refused"] += 1
+            return refused
+        return await self.run_operation(operation, params)
+
+    async def handle(self, reader, writer):
+        # HTTP/1.1 with keep-alive, so a client can send many requests over one connection
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length."}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, target, body, headers)
+                    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                data = json.dumps(payload, default=str).encode("utf-8")
+                head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                        f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+                if status == HTTPStatus.SERVICE_UNAVAILABLE:
+                    head += "Retry-After: 1\r\n"
+                writer.write(head.encode("latin-1") + b"\r\n" + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, on_ready=None):
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        stop = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        except (NotImplementedError, AttributeError):  # Windows
+            pass
+        try:
+            if on_ready:
+                on_ready(server)
+            async with server:
+                await stop.wait()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+# --- CLIENT ---
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def _connection(url=None, socket_path=None, timeout=300):
+    if socket_path:
+        return _UnixHTTPConnection(socket_path, timeout)
+    parts = urlsplit(url or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+    return http.client.HTTPConnection(parts.hostname, parts.port or DEFAULT_PORT, timeout=timeout)
+
+def call(operation, params, url=None, socket_path=None, timeout=300):
+    """Run an operation on a running server and return its result.
+
+    Paths are resolved against the caller's working directory before they are sent.
+    """
+    params = dict(params)
+    for key in ("file_path", "output_path", "output_dir"):
+        if isinstance(params.get(key), str):
+            params[key] = os.path.abspath(params[key])
+    conn = _connection(url, socket_path, timeout)
+    try:
+        conn.request("POST", f"/ops/{operation}", json.dumps(params), {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        payload = json.loads(response.read() or b"{}")
+    finally:
+        conn.close()
+    if response.status != HTTPStatus.OK:
+        raise RuntimeError(payload.get("error") or f"Server returned {response.status}.")
+    return payload["result"]
+
+def get_stats(url=None, socket_path=None, timeout=30):
+    conn = _connection(url, socket_path, timeout)
+    try:
+        conn.request("GET", "/stats")
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
@@ -0,0 +1,35 @@
+import os
+
+import pymupdf as fitz
+import pytest
+
+from pdf_ops import convert_words_to_pdf, run_batch
+
+def make_pdf(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+def test_same_names_in_different_folders(tmp_path):
+    make_pdf(str(tmp_path / "in" / "a" / "x.pdf"), "from a")
+    make_pdf(str(tmp_path / "in" / "b" / "x.pdf"), "from b")
+    out = tmp_path / "out"
+    summary = run_batch(str(tmp_path / "in"), "rotate", {"rotation": 90}, workers=1, output_dir=str(out))
+    assert summary["succeeded"] == 2
+    for folder in ("a", "b"):
+        with fitz.open(str(out / folder / "x_rotated.pdf")) as doc:
+            assert doc[0].get_text().strip() == f"from {folder}"
+
+def test_names_differing_in_extension_only(tmp_path):
+    make_pdf(str(tmp_path / "x.pdf"), "lower")
+    make_pdf(str(tmp_path / "x.PDF"), "upper")
+    with pytest.raises(ValueError, match="same output file"):
+        run_batch([str(tmp_path / "x.pdf"), str(tmp_path / "x.PDF")], "rotate", {"rotation": 90}, workers=1, output_dir=str(tmp_path / "out"))
+
+def test_word_documents_sharing_a_pdf_name(tmp_path):
+    for name in ("r.doc", "r.docx"):
+        (tmp_path / name).write_bytes(b"")
+    with pytest.raises(ValueError, match="same output file"):
+        convert_words_to_pdf(str(tmp_path), backend="libreoffice")
@@ -0,0 +1,33 @@
+import os
+
+import pymupdf as fitz
+import pytest
+
+import catalog
+
+def make_pdfs(folder, count):
+    for n in range(count):
+        doc = fitz.open()
+        doc.new_page()
+        doc.save(os.path.join(folder, f"f{n:02d}.pdf"))
+        doc.close()
+
+def test_interrupted_scan_keeps_progress(tmp_path, monkeypatch):
+    make_pdfs(str(tmp_path), 5)
+    db = str(tmp_path / "catalog.sqlite")
+    monkeypatch.setattr(catalog, "COMMIT_EVERY", 2)
+
+    def interrupt(done, total):
+        if done == 3:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        catalog.scan(str(tmp_path), db, workers=1, on_progress=interrupt)
+    conn = catalog.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 3
+    conn.close()
+
+    opened = []
+    monkeypatch.setattr(catalog, "_scan_file", lambda path, *args: opened.append(path) or (None, {"pages": 1}, None))
+    rows = catalog.scan(str(tmp_path), db, workers=1)
+    assert len(rows) == 5 and len(opened) == 2
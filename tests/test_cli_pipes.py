@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pymupdf as fitz
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def cli(*args, stdin=None):
+    return subprocess.run([sys.executable, "cli.py", *args], cwd=REPO, input=stdin, capture_output=True, check=True)
+
+@pytest.fixture
+def pdf_bytes():
+    doc = fitz.open()
+    for n in range(2):
+        doc.new_page().insert_text((72, 72), f"page {n + 1}")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def test_rotate_stdin_to_stdout(pdf_bytes):
+    out = cli("rotate", "-", "--degrees", "90", "--output", "-", stdin=pdf_bytes).stdout
+    assert out.startswith(b"%PDF-")
+    with fitz.open(stream=out, filetype="pdf") as doc:
+        assert [page.rotation for page in doc] == [90, 90]
+
+def test_extract_stdout_is_exactly_the_text(tmp_path, pdf_bytes):
+    path = tmp_path / "in.pdf"
+    path.write_bytes(pdf_bytes)
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        expected = "".join(page.get_text() + "\n\n" for page in doc).encode("utf-8")
+    assert cli("extract", str(path), "--stdout").stdout == expected
+    assert cli("extract", "-", "--output", "-", "--workers", "2", stdin=pdf_bytes).stdout == expected
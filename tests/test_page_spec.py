@@ -0,0 +1,40 @@
+import pytest
+
+from pdf_ops import format_page_spec, parse_page_spec
+
+@pytest.mark.parametrize("spec, expected", [
+    ("5", [4]),
+    ("-1", [9]),
+    ("3-5", [2, 3, 4]),
+    ("8-", [7, 8, 9]),
+    ("-3--1", [7, 8, 9]),
+    ("1-7:3", [0, 3, 6]),
+    ("odd", [0, 2, 4, 6, 8]),
+    ("even", [1, 3, 5, 7, 9]),
+    ("all", list(range(10))),
+    ("7,1-2", [6, 0, 1]),
+    ("1-3,2-4", [0, 1, 2, 3]),
+    (" 1 , 3 ", [0, 2]),
+    ("", []),
+])
+def test_parse(spec, expected):
+    assert parse_page_spec(spec, 10) == expected
+
+@pytest.mark.parametrize("spec", ["-", "-:2", "1-2:0", "5:2", "x", "1-2-3", "1:"])
+def test_invalid_selection(spec):
+    with pytest.raises(ValueError, match="Invalid page selection"):
+        parse_page_spec(spec, 10)
+
+@pytest.mark.parametrize("spec", ["0", "11", "-11", "5-11"])
+def test_out_of_range(spec):
+    with pytest.raises(ValueError, match="out of range"):
+        parse_page_spec(spec, 10)
+
+def test_reversed_range():
+    with pytest.raises(ValueError, match="end is before start"):
+        parse_page_spec("5-3", 10)
+
+def test_format_round_trip():
+    indices = [0, 1, 2, 4, 7, 8]
+    assert format_page_spec(indices) == "1-3,5,8-9"
+    assert parse_page_spec(format_page_spec(indices), 10) == indices
@@ -0,0 +1,31 @@
+import os
+
+import pymupdf as fitz
+
+import search_index
+
+def make_pdf(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+def test_path_filter_is_a_directory_not_a_string_prefix(tmp_path):
+    make_pdf(str(tmp_path / "b" / "one.pdf"), "quarterly report")
+    make_pdf(str(tmp_path / "bc" / "two.pdf"), "quarterly report")
+    db = str(tmp_path / "search.sqlite")
+    search_index.build_index(str(tmp_path), db, workers=1)
+
+    assert len(search_index.search("quarterly", db)) == 2
+    hits = search_index.search("quarterly", db, path_prefix=str(tmp_path / "b"))
+    assert [os.path.basename(hit["path"]) for hit in hits] == ["one.pdf"]
+
+def test_rebuild_only_sees_files_under_root(tmp_path):
+    make_pdf(str(tmp_path / "b" / "one.pdf"), "alpha")
+    make_pdf(str(tmp_path / "bc" / "two.pdf"), "alpha")
+    db = str(tmp_path / "search.sqlite")
+    search_index.build_index(str(tmp_path / "bc"), db, workers=1)
+    # Indexing b must neither re-use nor prune the entry for its sibling bc
+    assert search_index.build_index(str(tmp_path / "b"), db, workers=1)[:3] == (1, 0, 0)
+    assert len(search_index.search("alpha", db)) == 2
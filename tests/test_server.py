@@ -0,0 +1,33 @@
+from http import HTTPStatus
+
+import pytest
+
+from server import Server, path_params
+
+@pytest.fixture
+def server(tmp_path):
+    server = Server(workers=1, allow_writes=True, root=str(tmp_path))
+    yield server
+    server.pool.shutdown()
+
+def test_path_params_come_from_the_signature():
+    assert set(path_params("pdf-to-word")) == {"file_path", "output_path", "work_dir"}
+    assert "index_db" in path_params("redact")
+
+def test_paths_inside_root_pass(server, tmp_path):
+    params = {"file_path": str(tmp_path / "in.pdf"), "work_dir": str(tmp_path / "work")}
+    assert server.check_operation("pdf-to-word", params) is None
+
+@pytest.mark.parametrize("key", ["file_path", "output_path", "work_dir"])
+def test_paths_outside_root_refused(server, tmp_path, key):
+    params = {"file_path": str(tmp_path / "in.pdf"), key: "/elsewhere/x"}
+    status, body = server.check_operation("pdf-to-word", params)
+    assert status == HTTPStatus.FORBIDDEN and key in body["error"]
+
+def test_non_string_path_refused(server, tmp_path):
+    status, _ = server.check_operation("rotate", {"file_path": str(tmp_path / "in.pdf"), "output_path": ["/etc/x"]})
+    assert status == HTTPStatus.BAD_REQUEST
+
+def test_cache_refused(server, tmp_path):
+    status, _ = server.check_operation("extract", {"file_path": str(tmp_path / "in.pdf"), "cache": True})
+    assert status == HTTPStatus.FORBIDDEN
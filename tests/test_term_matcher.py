@@ -0,0 +1,33 @@
+from pdf_ops import _TermMatcher
+
+def matches(terms, text):
+    matcher = _TermMatcher(terms)
+    return [(text[start:end], matcher.terms[term_id]) for start, end, term_id in matcher.finditer(text)]
+
+def test_single_term():
+    assert matches(["secret"], "top secret and secret") == [("secret", "secret"), ("secret", "secret")]
+
+def test_case_insensitive():
+    assert matches(["John Smith"], "JOHN SMITH, john smith") == [("JOHN SMITH", "John Smith"), ("john smith", "John Smith")]
+
+def test_overlapping_terms():
+    found = matches(["he", "she", "hers", "his"], "ushers")
+    assert sorted(found) == [("he", "he"), ("hers", "hers"), ("she", "she")]
+
+def test_term_inside_another():
+    assert sorted(matches(["invoice", "voice"], "invoice")) == [("invoice", "invoice"), ("voice", "voice")]
+
+def test_repeated_overlap():
+    assert [start for start, _, _ in _TermMatcher(["aa"]).finditer("aaaa")] == [0, 1, 2]
+
+def test_offsets():
+    matcher = _TermMatcher(["ssn"])
+    assert list(matcher.finditer("my SSN: 1")) == [(3, 6, 0)]
+
+def test_empty_terms_ignored():
+    matcher = _TermMatcher(["", "abc"])
+    assert matcher.terms == ["abc"]
+    assert list(matcher.finditer("xabcx")) == [(1, 4, 0)]
+
+def test_no_match():
+    assert matches(["missing"], "nothing here") == []